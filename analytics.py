@@ -0,0 +1,282 @@
+"""
+Analytics over recorded event logs (see eventlog.py). Streams each log file line
+by line, accumulates per-level heatmaps (Hero path, Tag, Clash, kills, Tron
+crashes) and win-rate tables per mode / difficulty / level, runs one worker per
+file across a process pool and merges the partial results.
+
+    python3 analytics.py [logs/ or files ...]                    # tables + throughput
+    python3 analytics.py logs --show tag                         # heatmap overlay on each level
+    python3 analytics.py logs --csv out/                         # heatmap.csv, winrates.csv
+    python3 analytics.py --simulate 2000 --to logs/sim           # AI-vs-AI Blind Duel games to analyze
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import LEVELS, MODE_CLASSIC, MODE_TRON, _color_cell, _C
+
+LAYERS = ("hero", "tag", "clash", "shield", "kill", "crash", "enemy_hit")
+# 256-colour background ramp, cold to hot
+_HEAT = (17, 19, 21, 27, 33, 39, 44, 48, 82, 118, 154, 190, 226, 220, 214, 208, 202, 196)
+
+
+def _empty():
+    return {"games": 0, "records": 0, "bad_lines": 0, "heat": {}, "wins": {}}
+
+
+def _bump(agg, mode, level, layer, cell):
+    key = (mode, level, layer)
+    heat = agg["heat"].get(key)
+    if heat is None:
+        heat = agg["heat"][key] = Counter()
+    heat[(cell[0], cell[1])] += 1
+
+
+def _open_log(path):
+    return gzip.open(path, "rt") if path.endswith(".gz") else open(path)
+
+
+def aggregate_file(path):
+    """
+    One pass over one log file. Returns the partial aggregate:
+    heat[(mode, level, layer)] = Counter{(r, c): n},
+    wins[(mode, difficulty, level)] = [played, won].
+    """
+    agg = _empty()
+    heat_events = {"tag": "tag", "clash": "clash", "shield": "shield", "kill": "kill",
+                   "crash": "crash", "enemy_hit": "enemy_hit", "move": "hero"}
+    loads = json.loads
+    with _open_log(path) as f:
+        for line in f:
+            try:
+                rec = loads(line)
+            except ValueError:
+                agg["bad_lines"] += 1  # e.g. the tail of a file cut off by a crash
+                continue
+            agg["records"] += 1
+            ev = rec.get("ev")
+            mode = rec.get("mode")
+            level = rec.get("level")
+            layer = heat_events.get(ev)
+            if layer and level is not None and "at" in rec:
+                _bump(agg, mode, level, layer, rec["at"])
+            elif ev == "moves" and level is not None:
+                at = rec.get("hero_at")
+                for cell in (at if at and isinstance(at[0], list) else [at] if at else []):
+                    _bump(agg, mode, level, "hero", cell)
+            elif ev in ("level_clear", "level_fail"):
+                if ev == "level_fail" and rec.get("reason") == "quit":
+                    continue
+                key = (mode, rec.get("difficulty") or ("2p" if rec.get("two_player") else "-"), level)
+                row = agg["wins"].setdefault(key, [0, 0])
+                row[0] += 1
+                row[1] += ev == "level_clear"
+            elif ev == "game_start":
+                agg["games"] += 1
+    return agg
+
+
+def merge(into, part):
+    """Add one partial aggregate into another (in place) and return it."""
+    for k in ("games", "records", "bad_lines"):
+        into[k] += part[k]
+    for key, counts in part["heat"].items():
+        if key in into["heat"]:
+            into["heat"][key].update(counts)
+        else:
+            into["heat"][key] = counts
+    for key, (played, won) in part["wins"].items():
+        row = into["wins"].setdefault(key, [0, 0])
+        row[0] += played
+        row[1] += won
+    return into
+
+
+def _log_files(paths):
+    out = []
+    for p in paths:
+        if os.path.isdir(p):
+            out += sorted(os.path.join(p, f) for f in os.listdir(p)
+                          if f.endswith(".jsonl.gz") or f.endswith(".jsonl"))
+        else:
+            out.append(p)
+    return out
+
+
+def aggregate(files, jobs=None):
+    """Aggregate many files: one task per file across a process pool, merged as they finish."""
+    total = _empty()
+    if len(files) < 2 or jobs == 1:
+        for path in files:
+            merge(total, aggregate_file(path))
+        return total
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for part in pool.map(aggregate_file, files):
+            merge(total, part)
+    return total
+
+
+def _level_grid(mode, level):
+    if mode == "blind_duel":
+        from blind_duel import BLIND_DUEL_LEVELS
+        levels = BLIND_DUEL_LEVELS
+    elif mode in (MODE_CLASSIC, MODE_TRON):
+        levels = LEVELS
+    else:
+        return None
+    return levels[level] if 0 <= level < len(levels) else None
+
+
+def heat_overlay(grid, counts):
+    """The level with each visited cell's background coloured by count (log-ish scale)."""
+    top = max(counts.values(), default=0)
+    lines = []
+    for r, row in enumerate(grid):
+        line = ""
+        for c, ch in enumerate(row):
+            n = counts.get((r, c), 0)
+            if n:
+                i = min(len(_HEAT) - 1, int((len(_HEAT) - 1) * (n / top) ** 0.5))
+                line += f"\033[48;5;{_HEAT[i]}m" + ch + _C
+            else:
+                line += _color_cell(ch)
+        lines.append("  " + line)
+    return "\n".join(lines)
+
+
+def write_csv(agg, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "heatmap.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mode", "level", "layer", "row", "col", "count"])
+        for (mode, level, layer), counts in sorted(agg["heat"].items(), key=lambda kv: str(kv[0])):
+            for (r, c), n in sorted(counts.items()):
+                w.writerow([mode, level, layer, r, c, n])
+    with open(os.path.join(out_dir, "winrates.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mode", "difficulty", "level", "played", "hero_wins", "win_rate"])
+        for (mode, diff, level), (played, won) in sorted(agg["wins"].items(), key=lambda kv: str(kv[0])):
+            w.writerow([mode, diff, level, played, won, round(won / played, 4) if played else ""])
+
+
+def print_tables(agg):
+    print(f"  {'mode':<11}{'difficulty':<12}{'level':>6}{'played':>9}{'won':>8}{'win %':>8}")
+    for (mode, diff, level), (played, won) in sorted(agg["wins"].items(), key=lambda kv: str(kv[0])):
+        print(f"  {mode or '-':<11}{diff:<12}{level + 1 if level is not None else '-':>6}"
+              f"{played:>9}{won:>8}{100 * won / played:>7.1f}%")
+    layers = Counter()
+    for (mode, level, layer), counts in agg["heat"].items():
+        layers[layer] += sum(counts.values())
+    print("  events: " + "   ".join(f"{k} {layers[k]}" for k in LAYERS if layers[k]))
+
+
+def simulate(directory, games, k=2, seed=None):
+    """
+    Headless AI-vs-AI Blind Duel games, logged to directory: an AI Warden at a
+    random difficulty against a Hero that heads for G most of the time.
+    """
+    import eventlog
+    import main
+    import blind_duel as bd
+    main._muted = True
+    rng = random.Random(seed)
+    random.seed(seed)
+    eventlog.start(directory)
+    moves = list(bd.MOVE_MAP.values())
+    for _ in range(games):
+        difficulty = rng.choice(("easy", "medium", "hard"))
+        eventlog.new_game("blind_duel", difficulty=difficulty, two_player=False, k=k, heroes=1, wardens=1)
+        hp, shield = bd.HERO_START_HP, True
+        for level_num, rows in enumerate(bd.BLIND_DUEL_LEVELS):
+            grid = [list(row) for row in rows]
+            hero = bd.find_cells(grid, bd.HERO_CHAR)[0]
+            warden = bd.find_cells(grid, bd.WARDEN_CHAR)[0]
+            goal = bd.find_cells(grid, bd.GOAL_CHAR)[0]
+            gdist = bd._goal_distances(grid, goal)
+            stunned = False
+            eventlog.set_context(level=level_num, turn=0)
+            for turn in range(200):
+                if hero == goal or hp <= 0:
+                    break
+                hero_moves, pos = [], hero
+                for _ in range(k):
+                    options = [m for m in moves if bd._try_move(grid, pos[0], pos[1], *m) != pos] or [(0, 0)]
+                    if rng.random() < 0.7:
+                        options.sort(key=lambda m: gdist.get(bd._try_move(grid, pos[0], pos[1], *m), 1 << 30))
+                        m = options[0]
+                    else:
+                        m = rng.choice(options)
+                    hero_moves.append(m)
+                    pos = bd._try_move(grid, pos[0], pos[1], *m)
+                warden_moves = bd._ai_warden_moves(grid, hero, warden, goal, shield, difficulty, k)
+                eventlog.set_context(turn=turn)
+                eventlog.emit("moves", hero="".join(bd._REV_MOVE.get(m, "W") for m in hero_moves),
+                              warden="".join(bd._REV_MOVE.get(m, "W") for m in warden_moves),
+                              hero_at=list(hero), warden_at=list(warden))
+                hero, warden, hp, used, stunned, _ = bd._resolve_turn(
+                    grid, hero, warden, hero_moves, warden_moves, hp, shield, stunned)
+                shield = shield and not used
+            won = hero == goal
+            eventlog.emit("level_clear" if won else "level_fail",
+                          winner="hero" if won else "warden", turns=turn)
+            if not won:
+                break
+        eventlog.emit("game_end", winner="hero" if won else "warden", reached=level_num)
+    eventlog.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Heatmaps and win rates from recorded game events.")
+    ap.add_argument("paths", nargs="*", help="log files or directories (default ./logs)")
+    ap.add_argument("--show", choices=LAYERS, help="print this heatmap over every level that has one")
+    ap.add_argument("--csv", metavar="DIR", help="write heatmap.csv and winrates.csv here")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--simulate", type=int, default=0, metavar="N", help="log N AI-vs-AI Blind Duel games first")
+    ap.add_argument("--to", default=None, help="directory for --simulate logs")
+    args = ap.parse_args(argv)
+
+    if args.simulate:
+        import eventlog
+        out = args.to or eventlog.DEFAULT_DIR
+        t0 = time.perf_counter()
+        simulate(out, args.simulate)
+        print(f"  simulated {args.simulate} games in {time.perf_counter() - t0:.1f} s -> {out}")
+        if not args.paths:
+            args.paths = [out]
+    files = _log_files(args.paths or ["logs"])
+    if not files:
+        print("  No event logs found (record some with: python3 main.py --log).")
+        return 1
+
+    t0 = time.perf_counter()
+    agg = aggregate(files, args.jobs)
+    elapsed = time.perf_counter() - t0
+
+    if args.show:
+        for (mode, level, layer), counts in sorted(agg["heat"].items(), key=lambda kv: str(kv[0])):
+            grid = _level_grid(mode, level) if layer == args.show else None
+            if grid:
+                print(f"\n  {mode} level {level + 1} — {layer} ({sum(counts.values())} events)")
+                print(heat_overlay(grid, counts))
+        print()
+    print_tables(agg)
+    if args.csv:
+        write_csv(agg, args.csv)
+        print(f"  wrote {os.path.join(args.csv, 'heatmap.csv')} and winrates.csv")
+    rate = agg["games"] / elapsed if elapsed else 0.0
+    print(f"  {len(files)} files, {agg['games']} games, {agg['records']} records in {elapsed:.2f} s "
+          f"({rate:,.0f} games/s, {agg['records'] / elapsed if elapsed else 0:,.0f} records/s)"
+          + (f"   {agg['bad_lines']} unreadable lines" if agg["bad_lines"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,23 @@
 """
 Blind Duel — simultaneous "locked-in" 2-player chase game.
-Hero (@) vs Warden (W). Both commit 2 moves secretly, then reveal and resolve.
+Hero (@) vs Warden (W). Both commit K moves (2 by default, up to 5) secretly, then reveal and resolve.
 Inspired by Battleship + turn-based strategy.
 """
 import os
 import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
 # Import shared helpers from main
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import eventlog
+import spectate
 from main import (
-    clear_screen, find_cells, get_cell, set_cell,
+    clear_screen, find_cells, get_cell, set_cell, History, Camera,
     FLOOR, WALL, GOAL_CHAR, PLAYER_CHAR, HEALTH_CHAR,
-    _color_cell, _C, _P,
+    _C, _P,
     sfx_move, sfx_hurt, sfx_goal, sfx_gameover, sfx_win,
     _play_sfx,
 )
@@ -88,27 +93,198 @@ MOVE_MAP = {"R": (0, 1), "L": (0, -1), "U": (-1, 0), "D": (1, 0), "W": (0, 0)}
 _REV_MOVE = {(0, 1): "R", (0, -1): "L", (-1, 0): "U", (1, 0): "D", (0, 0): "W"}
 MAX_HP = 5
 HERO_START_HP = 4
+MOVES_PER_TURN = 2      # default commit horizon K
+MAX_MOVES_PER_TURN = 5
+_EXAMPLE_MOVES = "RULDR"
 
 
-def _parse_moves(s):
-    """Parse 'RU' or 'R U' into [(dr,dc), (dr,dc)]. Invalid -> (0,0) for that slot."""
-    s = s.upper().strip().replace(" ", "")[:2]
-    out = []
-    for c in (s[0] if len(s) > 0 else "W", s[1] if len(s) > 1 else "W"):
-        out.append(MOVE_MAP.get(c, (0, 0)))
-    return out
+def _parse_moves(s, k=MOVES_PER_TURN):
+    """Parse 'RU' or 'R U' into k moves [(dr,dc), ...]. Missing or invalid -> (0,0) for that slot."""
+    s = s.upper().strip().replace(" ", "")[:k].ljust(k, "W")
+    return [MOVE_MAP.get(c, (0, 0)) for c in s]
 
 
-def _get_move_pair(role):
-    """Get 2 moves from player. R=right, L=left, U=up, D=down, W=wait."""
+def _get_move_pair(role, k=MOVES_PER_TURN, rewind=False):
+    """
+    Get k moves from player. R=right, L=left, U=up, D=down, W=wait.
+    rewind (--debug only): '<' / '>' = undo / redo turn, returned as is.
+    """
     while True:
-        s = input(f"  {role}: Enter 2 moves (e.g. RU, LD, WW): ").strip().upper()
+        s = input(f"  {role}: Enter {k} moves (e.g. {_EXAMPLE_MOVES[:k]}, {'W' * k}"
+                  + ("; < undo, > redo" if rewind else "") + "): ").strip().upper()
+        if rewind and s in ("<", ">"):
+            return s
         if not s:
-            s = "WW"
-        moves = _parse_moves(s)
-        if len(moves) >= 2:
+            s = "W" * k
+        moves = _parse_moves(s, k)
+        if len(moves) >= k:
             return moves
-        print("  Use R/L/U/D/W (e.g. RU or R U)")
+        print(f"  Use R/L/U/D/W (e.g. {_EXAMPLE_MOVES[:k]} or {' '.join(_EXAMPLE_MOVES[:k])})")
+
+
+# ---- Move clock ----
+# Optional timed commit phase: a per-turn allowance plus a chess-style bank per
+# player. Input is polled, never blocked on, so an idle player cannot stall the game.
+COMMIT_POLL = 0.05      # seconds between input polls while a clock runs
+PROMPT_SECONDS = 5      # with a clock, "Press Enter" prompts go ahead after this long
+
+
+def _terminal_reader():
+    """
+    Non-blocking line input for the terminal: (read, discard). read() -> a
+    finished line, or None; discard() drops anything typed but not yet read.
+    """
+    if os.name == "nt":
+        import msvcrt
+        buf = []
+
+        def discard():
+            buf.clear()
+            while msvcrt.kbhit():
+                msvcrt.getwch()
+
+        def read():
+            while msvcrt.kbhit():
+                ch = msvcrt.getwche()
+                if ch in "\r\n":
+                    print()
+                    line = "".join(buf)
+                    buf.clear()
+                    return line
+                if ch == "\b":
+                    if buf:
+                        buf.pop()
+                else:
+                    buf.append(ch)
+            return None
+        return read, discard
+
+    import select
+    import termios
+
+    def read():
+        if select.select([sys.stdin], [], [], 0)[0]:
+            return sys.stdin.readline()
+        return None
+
+    def discard():
+        try:
+            termios.tcflush(sys.stdin, termios.TCIFLUSH)
+        except (termios.error, OSError, ValueError):
+            pass  # not a terminal (piped input): nothing half-typed to drop
+    return read, discard
+
+
+class MoveClock:
+    """
+    Timed commits. Each turn a player gets per_turn seconds; anything beyond
+    comes out of that player's bank, and with both spent the player times out
+    and auto ("wait" = all W, "auto" = a quick greedy move) commits for them.
+    read is the input backend (any non-blocking read() -> line or None) and
+    discard() drops its half-typed input; now and sleep are injectable so a
+    fake clock can drive it.
+    """
+
+    def __init__(self, per_turn, bank=0.0, auto="wait", read=None, discard=None,
+                 now=time.monotonic, sleep=time.sleep):
+        self.per_turn = per_turn
+        self.bank0 = bank
+        self.banks = {}
+        self.auto = auto
+        if read is None:
+            read, discard = _terminal_reader()
+        self.read = read
+        self.discard = discard or (lambda: None)
+        self.now = now
+        self.sleep = sleep
+
+    def bank(self, player):
+        return self.banks.setdefault(player, self.bank0)
+
+    def allowance(self, player):
+        return self.per_turn + self.bank(player)
+
+    def charge(self, player, elapsed):
+        """Take the time over the per-turn allowance out of the player's bank."""
+        self.banks[player] = max(0.0, self.bank(player) - max(0.0, elapsed - self.per_turn))
+
+    def describe(self, player):
+        return f"{self.per_turn:g}s + {self.bank(player):.0f}s bank"
+
+
+def commit_phase(readers, k, clock, on_timeout, rewind=False):
+    """
+    Collect several players' commits at once. readers: {player: read()}; each
+    player's clock runs from the start of the phase until their line arrives.
+    on_timeout(player) supplies the moves of a player who runs out of time;
+    their half-typed input is discarded so it cannot leak into the next line.
+    Returns ({player: moves, or '<' / '>' with rewind}, [players who timed out]).
+    """
+    start = clock.now()
+    pending = list(readers)
+    out, late = {}, []
+    while pending:
+        elapsed = clock.now() - start
+        for player in list(pending):
+            line = readers[player]()
+            if line is not None:
+                s = line.strip().upper()
+                out[player] = s if rewind and s in ("<", ">") else _parse_moves(s or "W" * k, k)
+            elif elapsed >= clock.allowance(player):
+                clock.discard()
+                out[player] = on_timeout(player)
+                late.append(player)
+            else:
+                continue
+            clock.charge(player, elapsed)
+            pending.remove(player)
+        if pending:
+            clock.sleep(COMMIT_POLL)
+    return out, late
+
+
+def _timed_line(clock, seconds):
+    """A fresh line from clock.read within seconds, else None (input typed before or unfinished is dropped)."""
+    clock.discard()
+    end = clock.now() + seconds
+    while clock.now() < end:
+        line = clock.read()
+        if line is not None:
+            return line
+        clock.sleep(COMMIT_POLL)
+    clock.discard()
+    return None
+
+
+def _commit(role, k, clock, grid, pos, target, rewind=False):
+    """
+    One player's moves: _get_move_pair when untimed, else under the clock. On
+    timeout, clock.auto picks: all W, or a greedy step sequence toward target.
+    """
+    if clock is None:
+        return _get_move_pair(role, k, rewind)
+
+    def on_timeout(_):
+        if clock.auto == "auto":
+            return _greedy_warden_moves(grid, target, pos, k)
+        return [(0, 0)] * k
+    clock.discard()
+    print(f"  {role}: Enter {k} moves ({clock.describe(role)}" + ("; < undo, > redo" if rewind else "") + "): ",
+          end="", flush=True)
+    out, late = commit_phase({role: clock.read}, k, clock, on_timeout, rewind)
+    if late:
+        print(f"\n  {role}: time's up — " + ("auto moves." if clock.auto == "auto" else f"{'W' * k}."))
+    return out[role]
+
+
+def _press_enter(clock, text):
+    """'Press Enter ...' pause; with a clock it goes ahead by itself after PROMPT_SECONDS."""
+    if clock is None:
+        input(f"\n  {text}...")
+        return
+    print(f"\n  {text} (auto in {PROMPT_SECONDS}s)...", end="", flush=True)
+    if _timed_line(clock, PROMPT_SECONDS) is None:
+        print()
 
 
 def _try_move(grid, r, c, dr, dc):
@@ -120,8 +296,114 @@ def _try_move(grid, r, c, dr, dc):
     return nr, nc
 
 
-def _ai_warden_moves(grid, hero_pos, warden_pos, goal_pos, hero_has_shield, difficulty):
-    """AI Warden chooses 2 moves. Returns [(dr,dc), (dr,dc)]."""
+# Distinct trajectories, memoized per (position, K) for the current grid
+_traj_memo = {}
+_traj_grid = None
+_TRAJ_MEMO_MAX = 4096
+
+
+def _trajectories(grid, pos, k):
+    """
+    Every distinct path of k moves from pos, as tuples of k + 1 cells. Moves
+    that bump a wall leave the agent where it was, exactly like W, so all
+    5^k raw sequences collapse to the distinct cell paths (at most 5^k, far
+    fewer near walls). Built from the (neighbor, k - 1) results, memoized.
+    """
+    global _traj_grid
+    if _traj_grid is not grid or len(_traj_memo) > _TRAJ_MEMO_MAX:
+        _traj_memo.clear()
+        _traj_grid = grid
+    key = (pos, k)
+    paths = _traj_memo.get(key)
+    if paths is None:
+        if k == 0:
+            paths = [(pos,)]
+        else:
+            nexts = {pos}
+            for dr, dc in MOVE_MAP.values():
+                nexts.add(_try_move(grid, pos[0], pos[1], dr, dc))
+            paths = [(pos,) + tail for n in sorted(nexts) for tail in _trajectories(grid, n, k - 1)]
+        _traj_memo[key] = paths
+    return paths
+
+
+def _goal_distances(grid, goal_pos):
+    """BFS steps from G to every reachable cell (memoized alongside the trajectories)."""
+    _trajectories(grid, goal_pos, 0)  # resets the memo if the grid changed
+    key = ("goal", goal_pos)
+    dist = _traj_memo.get(key)
+    if dist is None:
+        dist = {goal_pos: 0}
+        queue = [goal_pos]
+        for r, c in queue:
+            for dr, dc in ((0, 1), (0, -1), (-1, 0), (1, 0)):
+                q = (r + dr, c + dc)
+                if q not in dist and get_cell(grid, q[0], q[1]) != WALL:
+                    dist[q] = dist[(r, c)] + 1
+                    queue.append(q)
+        _traj_memo[key] = dist
+    return dist
+
+
+def _search_warden_moves(grid, hero_pos, warden_pos, goal_pos, k, cancel=None):
+    """
+    Warden's k moves from the distinct Hero and Warden trajectories. Hero paths
+    are weighted by progress toward G (2 ** steps gained), then folded into two
+    per-slot tables: where Heroes land (Clash) and which cell they just left
+    (Tag). Each Warden path scores the Hero weight it would hit, so the search
+    costs O((hero paths + warden paths) * k) instead of their product.
+    Returns None if cancel (a threading.Event) is set part way.
+    """
+    gdist = _goal_distances(grid, goal_pos)
+    far = len(gdist)
+    h0 = gdist.get(hero_pos, far)
+    land = [dict() for _ in range(k + 1)]
+    left = [dict() for _ in range(k + 1)]
+    for path in _trajectories(grid, hero_pos, k):
+        weight = 2.0 ** (h0 - gdist.get(path[-1], far))
+        for t in range(1, k + 1):
+            cell = path[t]
+            land[t][cell] = land[t].get(cell, 0.0) + weight
+            if cell != path[t - 1]:
+                left[t][path[t - 1]] = left[t].get(path[t - 1], 0.0) + weight
+
+    best, best_score = None, None
+    for n, path in enumerate(_trajectories(grid, warden_pos, k)):
+        if cancel is not None and n % 512 == 0 and cancel.is_set():
+            return None
+        hit = 0.0
+        for t in range(1, k + 1):
+            cell = path[t]
+            hit += land[t].get(cell, 0.0) + left[t].get(cell, 0.0)
+        # Ties: end between the Hero and G, then random so the Warden is not predictable
+        score = (hit, -abs(gdist.get(path[-1], far) - h0 // 2), random.random())
+        if best_score is None or score > best_score:
+            best, best_score = path, score
+    return [(b[0] - a[0], b[1] - a[1]) for a, b in zip(best, best[1:])]
+
+
+def _greedy_warden_moves(grid, hero_pos, warden_pos, k=MOVES_PER_TURN):
+    """Quick chase, used when the search runs out of time: step toward the Hero, else any open way."""
+    moves = []
+    r, c = warden_pos
+    for _ in range(k):
+        dr = 0 if hero_pos[0] == r else (1 if hero_pos[0] > r else -1)
+        dc = 0 if hero_pos[1] == c else (1 if hero_pos[1] > c else -1)
+        steps = [(dr, 0), (0, dc)] if dr and dc else [(dr, dc)]
+        steps += random.sample([(0, 1), (0, -1), (-1, 0), (1, 0)], 4)
+        for dr, dc in steps:
+            if (dr or dc) and get_cell(grid, r + dr, c + dc) != WALL:
+                break
+        else:
+            dr, dc = 0, 0
+        moves.append((dr, dc))
+        r, c = r + dr, c + dc
+    return moves
+
+
+def _ai_warden_moves(grid, hero_pos, warden_pos, goal_pos, hero_has_shield, difficulty, k=MOVES_PER_TURN,
+                     cancel=None):
+    """AI Warden chooses k moves. Returns [(dr,dc), ...] (None if cancel was set mid-search)."""
     hr, hc = hero_pos
     wr, wc = warden_pos
     gr, gc = goal_pos
@@ -142,7 +424,7 @@ def _ai_warden_moves(grid, hero_pos, warden_pos, goal_pos, hero_has_shield, diff
     moves = []
     if difficulty == "easy":
         # Random moves
-        for _ in range(2):
+        for _ in range(k):
             random.shuffle(dirs)
             for dr, dc in dirs:
                 if valid_step(warden_pos[0] + sum(m[0] for m in moves),
@@ -153,7 +435,7 @@ def _ai_warden_moves(grid, hero_pos, warden_pos, goal_pos, hero_has_shield, diff
                 moves.append((0, 0))
     elif difficulty == "medium":
         # 50% toward hero, 50% random
-        for i in range(2):
+        for i in range(k):
             cr = wr + sum(m[0] for m in moves)
             cc = wc + sum(m[1] for m in moves)
             if random.random() < 0.5:
@@ -175,46 +457,76 @@ def _ai_warden_moves(grid, hero_pos, warden_pos, goal_pos, hero_has_shield, diff
                 else:
                     moves.append((0, 0))
     else:
-        # Hard: pathfind toward hero, try to intercept
-        for i in range(2):
-            cr = wr + sum(m[0] for m in moves)
-            cc = wc + sum(m[1] for m in moves)
-            dr, dc = toward(hero_pos, (cr, cc))
-            if (dr or dc) and valid_step(cr, cc, dr, dc):
-                moves.append((dr, dc))
-            else:
-                for dr, dc in dirs:
-                    if valid_step(cr, cc, dr, dc):
-                        moves.append((dr, dc))
-                        break
-                else:
-                    moves.append((0, 0))
-    return moves[:2]
+        # Hard: search every distinct Hero and Warden trajectory for the best intercept
+        moves = _search_warden_moves(grid, hero_pos, warden_pos, goal_pos, k, cancel)
+    return moves[:k] if moves is not None else None
+
+
+WARDEN_THINK_BUDGET = 1.5   # seconds from turn start before the AI falls back to the greedy chase
+
+
+class SpeculativeWarden:
+    """
+    Computes the AI Wardens' moves on a worker thread from the start of the turn,
+    while the Heroes are still typing; the Warden never sees their commit, so
+    nothing is lost by starting early. result() waits at most until
+    WARDEN_THINK_BUDGET after start(); past that the search is cancelled and the
+    greedy chase is used. discard() drops a turn (undo), close() ends the worker.
+    """
+
+    def __init__(self, budget=WARDEN_THINK_BUDGET):
+        self.budget = budget
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warden")
+        self.future = None
+        self.cancel = threading.Event()
+        self.started = 0.0
+        self.fallback = []
+        self.stats = {"turns": 0, "ready": 0, "fallbacks": 0, "waited_s": 0.0}
+
+    def start(self, jobs):
+        """jobs: one (grid, hero_pos, warden_pos, goal_pos, hero_has_shield, difficulty, k) per AI Warden."""
+        self.discard()
+        cancel = self.cancel = threading.Event()
+        self.fallback = [(job[0], job[1], job[2], job[6]) for job in jobs]
+        self.started = time.monotonic()
+        self.future = self.pool.submit(lambda: [_ai_warden_moves(*job, cancel=cancel) for job in jobs])
+
+    def result(self):
+        """The Wardens' moves, waiting no later than the turn's budget."""
+        t0 = time.monotonic()
+        self.stats["turns"] += 1
+        if self.future.done():
+            self.stats["ready"] += 1
+        try:
+            moves = self.future.result(timeout=max(0.0, self.started + self.budget - t0))
+        except FutureTimeout:
+            moves = None
+        if moves is None or None in moves:
+            self.cancel.set()
+            self.stats["fallbacks"] += 1
+            moves = [_greedy_warden_moves(*args) for args in self.fallback]
+        self.stats["waited_s"] += time.monotonic() - t0
+        self.future = None
+        return moves
+
+    def discard(self):
+        if self.future is not None:
+            self.cancel.set()
+            self.future.cancel()
+            self.future = None
+
+    def close(self):
+        self.discard()
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 
 def _draw_blind_duel(grid, hero_pos, warden_pos, hero_hp, turn, last_msg,
-                     hero_has_shield, warden_stunned, ping_visible):
-    """Draw grid with Hero and Warden."""
-    display = [list(row) for row in grid]
-    hr, hc = hero_pos
-    wr, wc = warden_pos
-    for r, row in enumerate(display):
-        for c, cell in enumerate(row):
-            if (r, c) == (hr, hc):
-                display[r][c] = HERO_CHAR
-            elif (r, c) == (wr, wc):
-                display[r][c] = WARDEN_CHAR
-            elif cell in (HERO_CHAR, WARDEN_CHAR):
-                display[r][c] = FLOOR
-    for r, row in enumerate(display):
-        line = ""
-        for c, cell in enumerate(row):
-            if (r, c) == (hr, hc):
-                line += _P + HERO_CHAR + _C
-            elif (r, c) == (wr, wc):
-                line += WARDEN_COLOR + WARDEN_CHAR + _C
-            else:
-                line += _color_cell(cell)
+                     hero_has_shield, warden_stunned, ping_visible, camera=None, goal=None):
+    """Draw the camera window around the Hero, with Hero and Warden on top."""
+    camera = camera or Camera(grid)
+    camera.follow(*hero_pos)
+    marks = {warden_pos: WARDEN_COLOR + WARDEN_CHAR + _C, hero_pos: _P + HERO_CHAR + _C}
+    for line in camera.lines(grid, marks, goal):
         print("  " + line)
     print()
     print(f"  Hero HP: {hero_hp}/{MAX_HP}   Turn: {turn}")
@@ -229,6 +541,119 @@ def _draw_blind_duel(grid, hero_pos, warden_pos, hero_hp, turn, last_msg,
     print()
 
 
+def _settle(origin, dest):
+    """
+    Same-team collisions: teammates may not end a move slot on one cell. Every
+    mover on a shared cell goes back to where it started, which can free or
+    block other cells, so this repeats from a worklist. Each agent bounces at
+    most once: O(agents). origin/dest map agent index -> (r, c); dest is updated.
+    """
+    at = {}
+    for i, p in dest.items():
+        at.setdefault(p, []).append(i)
+    work = [p for p, who in at.items() if len(who) > 1]
+    while work:
+        who = at[work.pop()]
+        if len(who) < 2:
+            continue
+        for i in [i for i in who if dest[i] != origin[i]]:
+            who.remove(i)
+            dest[i] = origin[i]
+            back = at.setdefault(origin[i], [])
+            back.append(i)
+            if len(back) > 1:
+                work.append(origin[i])
+
+
+def resolve_team_turn(grid, heroes, wardens, hero_moves, warden_moves):
+    """
+    Resolve one simultaneous turn for any number of Heroes and Wardens.
+    heroes: [{"pos", "hp", "shield"}], wardens: [{"pos", "stunned"}]; updated in
+    place ("stunned" becomes next turn's value). hero_moves[i] / warden_moves[j]
+    are that agent's committed moves, one per slot. Returns event messages.
+
+    Per slot, destinations go into hash maps (cell -> agent) so every check is
+    O(agents): Clash = a Warden lands where a Hero lands; Tag = a Warden lands on
+    the cell a Hero just left. Each Warden causes at most one event per slot;
+    both agents in an event stop for the rest of the turn. The Mirror Shield
+    blocks the first event against its Hero and stuns that Warden. With one
+    Hero and one Warden this is exactly the classic 1v1 rule set.
+    """
+    solo = len(heroes) == 1 and len(wardens) == 1
+    msgs = []
+    frozen_h = set(i for i, h in enumerate(heroes) if h["hp"] <= 0)
+    frozen_w = set()
+    stunned = [w["stunned"] for w in wardens]
+    for w in wardens:
+        w["stunned"] = False
+    slots = max([len(m) for m in hero_moves] + [len(m) for m in warden_moves] + [0])
+
+    def name(kind, i):
+        return "" if solo else f"{kind} {i + 1}: "
+
+    for k in range(slots):
+        h_from = {i: h["pos"] for i, h in enumerate(heroes) if h["hp"] > 0}
+        h_to = dict(h_from)
+        for i in h_from:
+            if i not in frozen_h and k < len(hero_moves[i]):
+                dr, dc = hero_moves[i][k]
+                h_to[i] = _try_move(grid, h_from[i][0], h_from[i][1], dr, dc)
+        w_from = {j: w["pos"] for j, w in enumerate(wardens)}
+        w_to = dict(w_from)
+        w_dir = {}
+        for j in w_from:
+            if j not in frozen_w and k < len(warden_moves[j]):
+                dr, dc = warden_moves[j][k]
+                if stunned[j] and k == 0:
+                    dr, dc = 0, 0  # Warden skips first move when stunned
+                w_dir[j] = (dr, dc)
+                w_to[j] = _try_move(grid, w_from[j][0], w_from[j][1], dr, dc)
+        _settle(h_from, h_to)
+        _settle(w_from, w_to)
+
+        hero_at = {p: i for i, p in h_to.items()}
+        hero_left = {h_from[i]: i for i in h_to if h_to[i] != h_from[i]}
+        for i, p in h_to.items():
+            heroes[i]["pos"] = p
+        for j in sorted(w_to):
+            nw = w_to[j]
+            wardens[j]["pos"] = nw
+            if j in frozen_w:
+                continue
+            i = hero_at.get(nw)
+            clash = i is not None
+            if not clash:
+                i = hero_left.get(nw)
+                if i is None:
+                    continue
+            hero = heroes[i]
+            frozen_h.add(i)
+            frozen_w.add(j)
+            kind = "clash" if clash else "tag"
+            if hero["shield"]:
+                eventlog.emit("shield", blocked=kind, hero=i, warden=j, at=list(nw), slot=k)
+                hero["shield"] = False
+                wardens[j]["stunned"] = True
+                wardens[j]["pos"] = w_from[j]  # Warden stays put
+                msgs.append(name("Hero", i) + ("Mirror Shield! Warden stunned!" if clash
+                                               else "Mirror Shield! Warden predicted wrong!"))
+                continue
+            hero["hp"] -= 1
+            eventlog.emit(kind, hero=i, warden=j, at=list(nw), slot=k, hp=hero["hp"])
+            _play_sfx(sfx_hurt)
+            if clash:
+                wdr, wdc = w_dir.get(j, (0, 0))
+                back = (nw[0] - wdr * 2, nw[1] - wdc * 2)
+                if get_cell(grid, back[0], back[1]) != WALL:
+                    wardens[j]["pos"] = back
+                msgs.append(name("Hero", i) + "CLASH! Hero -1 HP, Warden pushed back!")
+            else:
+                msgs.append(name("Hero", i) + "TAG! Warden predicted your move. Hero -1 HP!")
+        if solo and msgs:
+            break
+    return msgs
+
+
 def _resolve_turn(grid, hero_pos, warden_pos, hero_moves, warden_moves,
                   hero_hp, hero_has_shield, warden_stunned):
     """
@@ -238,67 +663,24 @@ def _resolve_turn(grid, hero_pos, warden_pos, hero_moves, warden_moves,
     - Clash: Both land on same square. Hero -1 HP, Warden pushed back 2.
     - Mirror Shield: If Hero uses and Warden would hit, Warden stunned 1 turn.
     """
-    hr, hc = hero_pos
-    wr, wc = warden_pos
-    used_shield = False
-    warden_stunned_next = False
-
-    for i in range(2):
-        hdr, hdc = hero_moves[i]
-        wdr, wdc = warden_moves[i]
-        if warden_stunned and i == 0:
-            wdr, wdc = 0, 0  # Warden skips first move when stunned
-
-        nhr, nhc = _try_move(grid, hr, hc, hdr, hdc)
-        nwr, nwc = _try_move(grid, wr, wc, wdr, wdc)
-
-        # Collision: same final square (Clash)
-        if (nhr, nhc) == (nwr, nwc):
-            if hero_has_shield and not used_shield:
-                used_shield = True
-                warden_stunned_next = True
-                nwr, nwc = wr, wc  # Warden stays put
-                return (nhr, nhc), (nwr, nwc), hero_hp, True, True, "Mirror Shield! Warden stunned!"
-            hero_hp -= 1
-            back_dr = -wdr * 2 if wdr else 0
-            back_dc = -wdc * 2 if wdc else 0
-            nwr2 = nwr + back_dr
-            nwc2 = nwc + back_dc
-            if 0 <= nwr2 < len(grid) and 0 <= nwc2 < len(grid[0]) and get_cell(grid, nwr2, nwc2) != WALL:
-                nwr, nwc = nwr2, nwc2
-            _play_sfx(sfx_hurt)
-            return (nhr, nhc), (nwr, nwc), hero_hp, used_shield, False, "CLASH! Hero -1 HP, Warden pushed back!"
-
-        # Tag: Warden landed on Hero's previous square (Hero moved away)
-        if (nwr, nwc) == (hr, hc) and (nhr, nhc) != (hr, hc):
-            if hero_has_shield and not used_shield:
-                used_shield = True
-                warden_stunned_next = True
-                nwr, nwc = wr, wc
-                return (nhr, nhc), (nwr, nwc), hero_hp, True, True, "Mirror Shield! Warden predicted wrong!"
-            hero_hp -= 1
-            _play_sfx(sfx_hurt)
-            return (nhr, nhc), (nwr, nwc), hero_hp, used_shield, False, "TAG! Warden predicted your move. Hero -1 HP!"
-
-        # Tag: Hero stayed, Warden moved onto Hero
-        if (nwr, nwc) == (hr, hc) and (hdr, hdc) == (0, 0):
-            if hero_has_shield and not used_shield:
-                used_shield = True
-                warden_stunned_next = True
-                nwr, nwc = wr, wc
-                return (nhr, nhc), (nwr, nwc), hero_hp, True, True, "Mirror Shield! Warden's tag blocked!"
-            hero_hp -= 1
-            _play_sfx(sfx_hurt)
-            return (nhr, nhc), (nwr, nwc), hero_hp, used_shield, False, "TAG! Warden caught you. Hero -1 HP!"
-
-        hr, hc = nhr, nhc
-        wr, wc = nwr, nwc
+    hero = {"pos": hero_pos, "hp": hero_hp, "shield": hero_has_shield}
+    warden = {"pos": warden_pos, "stunned": warden_stunned}
+    msgs = resolve_team_turn(grid, [hero], [warden], [hero_moves], [warden_moves])
+    used_shield = hero_has_shield and not hero["shield"]
+    return (hero["pos"], warden["pos"], hero["hp"], used_shield, warden["stunned"],
+            msgs[0] if msgs else "Moves resolved.")
 
-    return (hr, hc), (wr, wc), hero_hp, used_shield, False, "Moves resolved."
 
-
-def _run_blind_duel_level(level_num, grid, hero_hp, hero_has_shield, two_player, difficulty):
-    """Run one Blind Duel level. Returns (hero_hp, hero_has_shield, won_level)."""
+def _run_blind_duel_level(level_num, grid, hero_hp, hero_has_shield, two_player, difficulty,
+                          k=MOVES_PER_TURN, warden_ai=None, clock=None, debug=False):
+    """
+    Run one Blind Duel level. Returns (hero_hp, hero_has_shield, won_level).
+    warden_ai: the game's SpeculativeWarden (vs Computer); one is made if not given.
+    clock: MoveClock for timed commits, or None to wait on input.
+    debug: '<' / '>' step back / forward through the level's turns (History).
+    """
+    if not two_player and warden_ai is None:
+        warden_ai = SpeculativeWarden()
     grid = [list(row) for row in grid]
     hero_pos = find_cells(grid, HERO_CHAR)[0]
     warden_pos = find_cells(grid, WARDEN_CHAR)[0]
@@ -313,51 +695,101 @@ def _run_blind_duel_level(level_num, grid, hero_hp, hero_has_shield, two_player,
     last_msg = ""
     ping_visible = False
     ping_cooldown = 0
+    hist = History()
+    camera = Camera(grid, hud_lines=14)
+    eventlog.set_context(level=level_num, turn=0)
+
+    def state():
+        return {"hero": hero_pos, "warden": warden_pos, "hp": hero_hp, "shield": hero_has_shield,
+                "stunned": warden_stunned, "ping": ping_visible, "cooldown": ping_cooldown,
+                "turn": turn, "msg": last_msg}
+
+    def step_history(cmd):
+        """Apply '<' (undo) or '>' (redo). Returns the restored state, or None."""
+        st = state()
+        if (hist.undo if cmd == "<" else hist.redo)(grid, st):
+            return st
+        return None
 
     while True:
         clear_screen()
         print(f"  BLIND DUEL — Level {level_num + 1}")
-        print("  Hero (@) vs Warden (W). Both lock in 2 moves. R/L/U/D/W")
+        print(f"  Hero (@) vs Warden (W). Both lock in {k} moves. R/L/U/D/W")
         print()
         _draw_blind_duel(grid, hero_pos, warden_pos, hero_hp, turn,
-                         last_msg, hero_has_shield, warden_stunned, ping_visible)
+                         last_msg, hero_has_shield, warden_stunned, ping_visible, camera, goal)
+        spectate.publish("blind_duel", level_num, grid,
+                         {"hero": hero_pos, "warden": warden_pos},
+                         {"hp": hero_hp, "turn": turn, "msg": last_msg, "shield": hero_has_shield})
 
         if hero_pos == goal:
             _play_sfx(sfx_goal)
+            eventlog.emit("level_clear", winner="hero", turns=turn, hp=hero_hp, shield=hero_has_shield)
             return hero_hp, hero_has_shield, True
 
         if hero_hp <= 0:
+            eventlog.emit("level_fail", winner="warden", turns=turn)
             return hero_hp, hero_has_shield, False
 
+        hist.begin(state())
+        ping_before = (ping_visible, ping_cooldown)
         # Ping: every 3 turns, Warden can ping (2-player: Warden chooses; vs AI: AI pings on hard)
         can_ping = turn > 0 and turn % 3 == 0 and ping_cooldown <= 0
         if can_ping and two_player:
-            p = input("  Warden: Ping to reveal Hero in 3x3? (y/n): ").strip().lower()
+            prompt = "  Warden: Ping to reveal Hero in 3x3? (y/n): "
+            if clock is None:
+                p = input(prompt).strip().lower()
+            else:
+                print(prompt, end="", flush=True)
+                p = (_timed_line(clock, clock.per_turn) or "n").strip().lower()
             if p == "y":
                 ping_visible = True
                 ping_cooldown = 3
+                eventlog.emit("ping", turn=turn, hero_at=list(hero_pos))
         elif can_ping and not two_player and difficulty == "hard":
             ping_visible = True
             ping_cooldown = 3
+            eventlog.emit("ping", turn=turn, hero_at=list(hero_pos))
 
-        # Commit phase
+        # Commit phase (with debug on, '<' / '>' from either player steps back / forward a turn instead)
         if two_player:
             print("  Hero: enter moves (Warden look away)")
-            hero_moves = _get_move_pair("Hero")
-            print()
-            print("  Warden: enter moves (Hero look away)")
-            warden_moves = _get_move_pair("Warden")
+            hero_moves = _commit("Hero", k, clock, grid, hero_pos, goal, debug)
+            if not isinstance(hero_moves, str):
+                print()
+                print("  Warden: enter moves (Hero look away)")
+                warden_moves = _commit("Warden", k, clock, grid, warden_pos, hero_pos, debug)
+                if isinstance(warden_moves, str):
+                    hero_moves = warden_moves
         else:
-            hero_moves = _get_move_pair("Hero")
-            warden_moves = _ai_warden_moves(
-                grid, hero_pos, warden_pos, goal,
-                hero_has_shield, difficulty
-            )
-            s = "".join(_REV_MOVE.get(m, "W") for m in warden_moves)
-            print(f"  Warden (AI) chose: {s}")
+            # The Warden thinks while the Hero types
+            warden_ai.start([(grid, hero_pos, warden_pos, goal, hero_has_shield, difficulty, k)])
+            hero_moves = _commit("Hero", k, clock, grid, hero_pos, goal, debug)
+            if not isinstance(hero_moves, str):
+                warden_moves = warden_ai.result()[0]
+                s = "".join(_REV_MOVE.get(m, "W") for m in warden_moves)
+                print(f"  Warden (AI) chose: {s}")
+        if isinstance(hero_moves, str):
+            if warden_ai is not None:
+                warden_ai.discard()
+            hist.abort()
+            ping_visible, ping_cooldown = ping_before
+            st = step_history(hero_moves)
+            if st is None:
+                last_msg = "Nothing to undo." if hero_moves == "<" else "Nothing to redo."
+                continue
+            hero_pos, warden_pos, hero_hp = st["hero"], st["warden"], st["hp"]
+            hero_has_shield, warden_stunned = st["shield"], st["stunned"]
+            ping_visible, ping_cooldown, turn, last_msg = st["ping"], st["cooldown"], st["turn"], st["msg"]
+            eventlog.emit("undo" if hero_moves == "<" else "redo", turn=turn)
+            continue
 
         # Reveal
-        input("\n  Press Enter to REVEAL...")
+        _press_enter(clock, "Press Enter to REVEAL")
+        eventlog.set_context(turn=turn)
+        eventlog.emit("moves", hero="".join(_REV_MOVE.get(m, "W") for m in hero_moves),
+                      warden="".join(_REV_MOVE.get(m, "W") for m in warden_moves),
+                      hero_at=list(hero_pos), warden_at=list(warden_pos))
         hero_pos, warden_pos, hero_hp, used_shield, warden_stunned_next, last_msg = _resolve_turn(
             grid, hero_pos, warden_pos, hero_moves, warden_moves,
             hero_hp, hero_has_shield, warden_stunned
@@ -372,6 +804,7 @@ def _run_blind_duel_level(level_num, grid, hero_hp, hero_has_shield, two_player,
             hero_hp = min(MAX_HP, hero_hp + 1)
             set_cell(grid, hero_pos[0], hero_pos[1], FLOOR)
             last_msg = f"Health +1 (now {hero_hp}/{MAX_HP})"
+            eventlog.emit("pickup", item="health", at=list(hero_pos), hp=hero_hp)
             _play_sfx(sfx_move)  # pickup sound
         elif cell == GOAL_CHAR:
             pass  # Win handled at start of next loop
@@ -381,16 +814,222 @@ def _run_blind_duel_level(level_num, grid, hero_hp, hero_has_shield, two_player,
             ping_cooldown -= 1
         if ping_visible and ping_cooldown < 2:
             ping_visible = False
+        hist.commit(grid, state())
+
+
+def _spawn(grid, char, n, taken):
+    """
+    Start cells for n agents: the level's own char markers first, then the free
+    floor cells nearest the first marker (BFS), skipping cells in taken.
+    """
+    cells = [p for p in find_cells(grid, char) if p not in taken][:n]
+    if len(cells) < n and cells:
+        seen = set(cells)
+        queue = [cells[0]]
+        for r, c in queue:
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                q = (r + dr, c + dc)
+                if q in seen or get_cell(grid, q[0], q[1]) != FLOOR:
+                    continue
+                seen.add(q)
+                queue.append(q)
+                if q not in taken:
+                    cells.append(q)
+                    if len(cells) == n:
+                        return cells
+    return cells
+
+
+def _draw_team(grid, heroes, wardens, turn, last_msg, camera=None, goal=None):
+    """Draw the camera window around the first live Hero, then one status line per Hero."""
+    camera = camera or Camera(grid, hud_lines=10 + len(heroes))
+    live = [h["pos"] for h in heroes if h["hp"] > 0]
+    camera.follow(*(live[0] if live else heroes[0]["pos"]))
+    marks = {w["pos"]: WARDEN_COLOR + WARDEN_CHAR + _C for w in wardens}
+    marks.update({p: _P + HERO_CHAR + _C for p in live})
+    for line in camera.lines(grid, marks, goal):
+        print("  " + line)
+    print()
+    for i, h in enumerate(heroes):
+        status = f"HP {h['hp']}/{MAX_HP}" if h["hp"] > 0 else "DOWN"
+        shield = "   [Mirror Shield ready]" if h["shield"] and h["hp"] > 0 else ""
+        print(f"  Hero {i + 1} {list(h['pos'])}: {status}{shield}")
+    stunned = [str(j + 1) for j, w in enumerate(wardens) if w["stunned"]]
+    if stunned:
+        print(f"  Warden {', '.join(stunned)} STUNNED this turn!")
+    print(f"  Turn: {turn}")
+    if last_msg:
+        print(f"  >> {last_msg}")
+    print()
+
+
+def _run_team_level(level_num, grid, heroes, n_wardens, two_player, difficulty, k=MOVES_PER_TURN,
+                    warden_ai=None, clock=None):
+    """
+    Run one Blind Duel level with N Heroes vs M Wardens. heroes carries HP and
+    shields between levels (positions are re-spawned). Returns won_level: True
+    when any Hero reaches G, False when every Hero is down.
+    """
+    if not two_player and warden_ai is None:
+        warden_ai = SpeculativeWarden()
+    grid = [list(row) for row in grid]
+    goals = find_cells(grid, GOAL_CHAR)
+    goal = goals[0] if goals else (len(grid) - 2, len(grid[0]) - 2)
+    hero_cells = _spawn(grid, HERO_CHAR, len(heroes), set())
+    warden_cells = _spawn(grid, WARDEN_CHAR, n_wardens, set(hero_cells))
+    for p in find_cells(grid, HERO_CHAR) + find_cells(grid, WARDEN_CHAR):
+        set_cell(grid, p[0], p[1], FLOOR)
+    for h, p in zip(heroes, hero_cells):
+        h["pos"] = p
+    wardens = [{"pos": p, "stunned": False} for p in warden_cells]
+    camera = Camera(grid, hud_lines=10 + len(heroes))
+    turn = 0
+    last_msg = ""
+    eventlog.set_context(level=level_num, turn=0)
+
+    while True:
+        clear_screen()
+        print(f"  BLIND DUEL — Level {level_num + 1}   {len(heroes)} Heroes vs {len(wardens)} Wardens")
+        print(f"  Every agent locks in {k} moves. R/L/U/D/W")
+        print()
+        _draw_team(grid, heroes, wardens, turn, last_msg, camera, goal)
+        ents = {f"hero{i + 1}": h["pos"] for i, h in enumerate(heroes) if h["hp"] > 0}
+        ents.update({f"warden{j + 1}": w["pos"] for j, w in enumerate(wardens)})
+        spectate.publish("blind_duel", level_num, grid, ents,
+                         {"hp": sum(max(0, h["hp"]) for h in heroes), "turn": turn, "msg": last_msg})
+
+        live = [h for h in heroes if h["hp"] > 0]
+        if any(h["pos"] == goal for h in live):
+            _play_sfx(sfx_goal)
+            eventlog.emit("level_clear", winner="hero", turns=turn, hp=[h["hp"] for h in heroes])
+            return True
+        if not live:
+            eventlog.emit("level_fail", winner="warden", turns=turn)
+            return False
+
+        # Commit phase
+        if two_player:
+            print("  Heroes: enter moves (Wardens look away)")
+        else:
+            jobs = []
+            for w in wardens:
+                target = min(live, key=lambda h: abs(h["pos"][0] - w["pos"][0]) + abs(h["pos"][1] - w["pos"][1]))
+                jobs.append((grid, target["pos"], w["pos"], goal, target["shield"], difficulty, k))
+            warden_ai.start(jobs)  # the Wardens think while the Heroes type
+        hero_moves = []
+        for i, h in enumerate(heroes):
+            hero_moves.append(_commit(f"Hero {i + 1}", k, clock, grid, h["pos"], goal) if h["hp"] > 0 else [])
+        warden_moves = []
+        if two_player:
+            print()
+            print("  Wardens: enter moves (Heroes look away)")
+            for j, w in enumerate(wardens):
+                target = min(live, key=lambda h: abs(h["pos"][0] - w["pos"][0]) + abs(h["pos"][1] - w["pos"][1]))
+                warden_moves.append(_commit(f"Warden {j + 1}", k, clock, grid, w["pos"], target["pos"]))
+        else:
+            warden_moves = warden_ai.result()
+            s = " ".join("".join(_REV_MOVE.get(m, "W") for m in ms) for ms in warden_moves)
+            print(f"  Wardens (AI) chose: {s}")
+
+        # Reveal
+        _press_enter(clock, "Press Enter to REVEAL")
+        eventlog.set_context(turn=turn)
+        eventlog.emit("moves", hero=["".join(_REV_MOVE.get(m, "W") for m in ms) for ms in hero_moves],
+                      warden=["".join(_REV_MOVE.get(m, "W") for m in ms) for ms in warden_moves],
+                      hero_at=[list(h["pos"]) for h in heroes], warden_at=[list(w["pos"]) for w in wardens])
+        msgs = resolve_team_turn(grid, heroes, wardens, hero_moves, warden_moves)
+        last_msg = " ".join(msgs) if msgs else "Moves resolved."
+
+        # Pickups: each Hero grabs + (health)
+        for h in heroes:
+            if h["hp"] > 0 and get_cell(grid, h["pos"][0], h["pos"][1]) == HEALTH_CHAR:
+                h["hp"] = min(MAX_HP, h["hp"] + 1)
+                set_cell(grid, h["pos"][0], h["pos"][1], FLOOR)
+                eventlog.emit("pickup", item="health", at=list(h["pos"]), hp=h["hp"])
+                _play_sfx(sfx_move)  # pickup sound
+        turn += 1
+
+
+def _ask_moves_per_turn():
+    """Commit horizon K, 1-5. Enter = MOVES_PER_TURN."""
+    while True:
+        s = input(f"  Moves per turn (1-{MAX_MOVES_PER_TURN}, Enter = {MOVES_PER_TURN}): ").strip()
+        if not s:
+            return MOVES_PER_TURN
+        if s.isdigit() and 1 <= int(s) <= MAX_MOVES_PER_TURN:
+            return int(s)
+        print(f"  Enter a number from 1 to {MAX_MOVES_PER_TURN}.")
+
+
+def _ask_move_clock():
+    """'15' or '15+60' -> MoveClock (seconds per turn [+ bank]); Enter = untimed (None)."""
+    while True:
+        s = input("  Move clock, seconds per turn[+bank] (e.g. 15 or 15+60; Enter = untimed): ").strip()
+        if not s:
+            return None
+        parts = s.split("+")
+        if len(parts) <= 2 and all(p.strip().isdigit() for p in parts) and int(parts[0]) > 0:
+            a = input("  On timeout: wait (W) or auto-move (A)? (w/a): ").strip().lower()
+            return MoveClock(int(parts[0]), int(parts[1]) if len(parts) > 1 else 0,
+                             auto="auto" if a == "a" else "wait")
+        print("  Enter seconds like 15 or 15+60.")
+
+
+def _ask_team_size():
+    """'2v2', '4v1' ... -> (heroes, wardens), each 1-4. Enter = 1v1."""
+    while True:
+        s = input("  Team sizes, Heroes v Wardens (e.g. 2v2, 4v1; Enter = 1v1): ").strip().lower()
+        if not s:
+            return 1, 1
+        parts = s.split("v")
+        if len(parts) == 2 and all(p.strip().isdigit() and 1 <= int(p) <= 4 for p in parts):
+            return int(parts[0]), int(parts[1])
+        print("  Use NvM with N and M from 1 to 4.")
+
+
+def _run_team_duel(n_heroes, n_wardens, two_player, difficulty, k=MOVES_PER_TURN, warden_ai=None, clock=None):
+    heroes = [{"pos": None, "hp": HERO_START_HP, "shield": True} for _ in range(n_heroes)]
+    eventlog.new_game("blind_duel", difficulty=None if two_player else difficulty, two_player=two_player,
+                      k=k, heroes=n_heroes, wardens=n_wardens)
+    for level_num in range(len(BLIND_DUEL_LEVELS)):
+        won = _run_team_level(level_num, BLIND_DUEL_LEVELS[level_num], heroes, n_wardens,
+                              two_player, difficulty, k, warden_ai, clock)
+        if not won:
+            eventlog.emit("game_end", winner="warden", reached=level_num)
+            clear_screen()
+            _play_sfx(sfx_gameover)
+            print("\n  *** WARDENS WIN — ALL HEROES FELL ***")
+            print(f"  Reached level {level_num + 1}")
+            print()
+            return
+        for h in heroes:
+            h["hp"] = max(h["hp"], 1)  # downed Heroes rejoin for the next level
+        if level_num < len(BLIND_DUEL_LEVELS) - 1:
+            clear_screen()
+            _play_sfx(sfx_goal)
+            print(f"\n  *** LEVEL {level_num + 1} CLEAR ***")
+            print("  " + "   ".join(f"Hero {i + 1} HP: {h['hp']}/{MAX_HP}" for i, h in enumerate(heroes)))
+            _press_enter(clock, "Press Enter for next level")
+    eventlog.emit("game_end", winner="hero", reached=len(BLIND_DUEL_LEVELS) - 1)
+    clear_screen()
+    _play_sfx(sfx_win)
+    print("\n  *** HEROES WIN! ***")
+    print("  All levels cleared. You out-predicted the Wardens.")
+    print()
 
 
 def run_blind_duel():
-    """Main entry: menu for 2-player or vs Computer."""
+    """
+    Main entry: menu for 2-player or vs Computer. With --debug on the command
+    line, 1v1 players can enter '<' / '>' to step turns back and forward.
+    """
+    debug = "--debug" in sys.argv
     clear_screen()
     print()
     print("  ╔══════════════════════════════════╗")
     print("  ║   BLIND DUEL — The Locked-In     ║")
     print("  ║   Hero (@) vs Warden (W)         ║")
-    print("  ║   Both commit 2 moves. Reveal!   ║")
+    print("  ║   Both commit K moves. Reveal!   ║")
     print("  ╚══════════════════════════════════╝")
     print()
     print("  1 = 2 Player   (Hero vs Warden on same keyboard)")
@@ -411,17 +1050,35 @@ def run_blind_duel():
             break
         print("  Enter 1 or 2.")
     print()
+    n_heroes, n_wardens = _ask_team_size()
+    k = _ask_moves_per_turn()
+    clock = _ask_move_clock()
+    print()
     input("  Press Enter to start...")
+    warden_ai = None if two_player else SpeculativeWarden()
+    try:
+        if (n_heroes, n_wardens) != (1, 1):
+            _run_team_duel(n_heroes, n_wardens, two_player, difficulty, k, warden_ai, clock)
+        else:
+            _run_solo_duel(two_player, difficulty, k, warden_ai, clock, debug)
+    finally:
+        if warden_ai is not None:
+            warden_ai.close()  # also on Ctrl-C / quit: stops a search still running
+
 
+def _run_solo_duel(two_player, difficulty, k=MOVES_PER_TURN, warden_ai=None, clock=None, debug=False):
     hero_hp = HERO_START_HP
     hero_has_shield = True  # 1-time Mirror Shield
+    eventlog.new_game("blind_duel", difficulty=None if two_player else difficulty, two_player=two_player,
+                      k=k, heroes=1, wardens=1)
 
     for level_num in range(len(BLIND_DUEL_LEVELS)):
         grid = BLIND_DUEL_LEVELS[level_num]
         hero_hp, hero_has_shield, won = _run_blind_duel_level(
-            level_num, grid, hero_hp, hero_has_shield, two_player, difficulty
+            level_num, grid, hero_hp, hero_has_shield, two_player, difficulty, k, warden_ai, clock, debug
         )
         if not won:
+            eventlog.emit("game_end", winner="warden" if hero_hp <= 0 else None, reached=level_num)
             clear_screen()
             if hero_hp <= 0:
                 _play_sfx(sfx_gameover)
@@ -436,8 +1093,9 @@ def run_blind_duel():
             _play_sfx(sfx_goal)
             print(f"\n  *** LEVEL {level_num + 1} CLEAR ***")
             print(f"  Hero HP: {hero_hp}/{MAX_HP}")
-            input("\n  Press Enter for next level...")
+            _press_enter(clock, "Press Enter for next level")
 
+    eventlog.emit("game_end", winner="hero", reached=len(BLIND_DUEL_LEVELS) - 1)
     clear_screen()
     _play_sfx(sfx_win)
     print("\n  *** HERO WINS! ***")
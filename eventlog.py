@@ -0,0 +1,182 @@
+"""
+Structured game event log: every rule event (moves committed, Tag, Clash, Mirror
+Shield, ping, pickup, kill, crash, level clear ...) as one JSON record. The game
+thread only appends to an in-memory queue; a background thread batches records
+into gzip-compressed JSONL files and rotates them every ROTATE_RECORDS records.
+
+    python3 main.py --log [dir]        # play and log (default ./logs)
+    python3 eventlog.py --bench [N]    # emit cost and writer throughput
+
+Record: {"ts": unix time, "ev": kind, "game": id, "mode": ..., "level": ..., ...fields}
+Files: events-<YYYYmmdd-HHMMSS>-<pid>-<n>.jsonl.gz (".part" while being written).
+"""
+import atexit
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+ROTATE_RECORDS = 100_000  # records per file before starting the next one
+FLUSH_EVERY = 0.5         # seconds the writer waits between batches
+MAX_QUEUE = 1_000_000     # records held in memory before new ones are dropped
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
+
+class EventLog:
+    """Queue plus writer thread. emit() is safe to call from any thread and never blocks on I/O."""
+
+    def __init__(self, directory=DEFAULT_DIR, rotate_records=ROTATE_RECORDS, flush_every=FLUSH_EVERY):
+        self.directory = directory
+        self.rotate_records = rotate_records
+        self.flush_every = flush_every
+        self.queue = deque()
+        self.context = {}
+        self.stats = {"emitted": 0, "written": 0, "dropped": 0, "batches": 0, "files": 0}
+        self._stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._file = None
+        self._path = None
+        self._in_file = 0
+        self._wake = threading.Event()
+        self._stop = False
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="eventlog", daemon=True)
+        self._thread.start()
+
+    # ---- game side ----
+    def set_context(self, **fields):
+        """Fields added to every following record (game, mode, level, ...). None removes a field."""
+        ctx = dict(self.context)
+        for k, v in fields.items():
+            if v is None:
+                ctx.pop(k, None)
+            else:
+                ctx[k] = v
+        self.context = ctx  # swapped, never mutated: queued records keep their snapshot
+
+    def emit(self, ev, fields):
+        if len(self.queue) >= MAX_QUEUE:
+            self.stats["dropped"] += 1
+            return
+        self.queue.append((time.time(), ev, self.context, fields))
+        self.stats["emitted"] += 1
+
+    def close(self):
+        """Write everything still queued, then close the current file."""
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+
+    # ---- writer thread ----
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_every)
+            self._wake.clear()
+            stop = self._stop
+            self._drain()
+            if stop:
+                self._finish_file()
+                return
+
+    def _drain(self):
+        queue = self.queue
+        dumps = json.dumps
+        while queue:
+            if self._file is None:
+                self._open_file()
+            room = self.rotate_records - self._in_file
+            lines = []
+            while queue and len(lines) < room:
+                ts, ev, ctx, fields = queue.popleft()
+                rec = {"ts": round(ts, 3), "ev": ev}
+                rec.update(ctx)
+                rec.update(fields)
+                lines.append(dumps(rec, separators=(",", ":")))
+            self._file.write(("\n".join(lines) + "\n").encode())
+            self._in_file += len(lines)
+            self.stats["written"] += len(lines)
+            self.stats["batches"] += 1
+            if self._in_file >= self.rotate_records:
+                self._finish_file()
+
+    def _open_file(self):
+        name = f"events-{self._stamp}-{os.getpid()}-{self.stats['files']:04d}.jsonl.gz"
+        self._path = os.path.join(self.directory, name)
+        self._file = gzip.open(self._path + ".part", "wb", compresslevel=6)
+        self._in_file = 0
+        self.stats["files"] += 1
+
+    def _finish_file(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._path + ".part", self._path)  # readers only ever see whole files
+        self._file = None
+
+
+# The running log, if any. Kept here (not in main) so every module sees the same one.
+_log = None
+
+
+def start(directory=None, **kwargs):
+    """Start logging into directory (default ./logs next to the game). Returns the EventLog."""
+    global _log
+    _log = EventLog(directory or DEFAULT_DIR, **kwargs)
+    atexit.register(stop)
+    return _log
+
+
+def stop():
+    """Flush and close the log; later emits are no-ops."""
+    global _log
+    log, _log = _log, None
+    if log is not None:
+        log.close()
+
+
+def emit(ev, **fields):
+    """Record one event; a no-op unless start() was called."""
+    if _log is not None:
+        _log.emit(ev, fields)
+
+
+def set_context(**fields):
+    if _log is not None:
+        _log.set_context(**fields)
+
+
+def new_game(mode, **meta):
+    """Tag the following records with a fresh game id plus mode/meta, and log game_start."""
+    if _log is not None:
+        _log.context = {}
+        _log.set_context(game=uuid.uuid4().hex[:12], mode=mode, **meta)
+        _log.emit("game_start", {})
+
+
+def _bench(n):
+    import tempfile
+    with tempfile.TemporaryDirectory() as d:
+        log = EventLog(d, rotate_records=max(1, n // 4))
+        log.set_context(game="bench", mode="blind_duel", level=0)
+        t0 = time.perf_counter()
+        for i in range(n):
+            log.emit("tag", {"hero": 0, "warden": 0, "at": [i % 20, i % 40], "slot": 1})
+        emit_s = time.perf_counter() - t0
+        log.close()
+        total = time.perf_counter() - t0
+        size = sum(os.path.getsize(os.path.join(d, f)) for f in os.listdir(d))
+        files = sorted(os.listdir(d))
+    print(f"{n} records: emit {emit_s / n * 1e6:.2f} us each ({n / emit_s:,.0f}/s on the game thread)")
+    print(f"  written and closed in {total:.2f} s ({n / total:,.0f}/s)   {len(files)} files, "
+          f"{size / n:.1f} B/record compressed   dropped {log.stats['dropped']}")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        nums = [int(a) for a in sys.argv[1:] if a.isdigit()]
+        _bench(nums[0] if nums else 500_000)
+    else:
+        print(__doc__)
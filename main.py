@@ -4,6 +4,10 @@ import struct
 import subprocess
 import sys
 import tempfile
+from collections import OrderedDict, deque
+
+import eventlog
+import spectate
 
 # ---- 8-bit style sound (square wave WAV, no extra deps) ----
 SAMPLE_RATE = 22050
@@ -82,6 +86,11 @@ def _play_wav_nonblocking(wav_bytes):
 # Mute toggle (press m in-game)
 _muted = False
 
+def _toggle_mute():
+    global _muted
+    _muted = not _muted
+    return "Sound muted." if _muted else "Sound on."
+
 def _play_sfx(sfx_func):
     if not _muted:
         sfx_func()
@@ -107,7 +116,15 @@ def sfx_gameover():
 def sfx_win():
     _play_wav_nonblocking(_make_multi_note_wav([(523, 100), (659, 100), (784, 100), (1047, 200)], 0.25))
 
-# Joystick-style: read one key (arrows, wasd, or q)
+# Key name (from get_key) -> (dr, dc)
+KEY_DIRS = {
+    "up": (-1, 0), "w": (-1, 0),
+    "down": (1, 0), "s": (1, 0),
+    "left": (0, -1), "a": (0, -1),
+    "right": (0, 1), "d": (0, 1),
+}
+
+# Joystick-style: read one key (arrows, wasd, q, m, u = undo, r = redo)
 def get_key():
     if os.name == "nt":
         import msvcrt
@@ -115,6 +132,8 @@ def get_key():
         if ch in (b"q", b"Q"):
             return "q"
         if ch in (b"m", b"M"): return "m"
+        if ch in (b"u", b"U"): return "u"
+        if ch in (b"r", b"R"): return "r"
         if ch in (b"w", b"W"): return "w"
         if ch in (b"a", b"A"): return "a"
         if ch in (b"s", b"S"): return "s"
@@ -144,8 +163,8 @@ def get_key():
                 if c3 == "D": return "left"
         if c in ("q", "Q"):
             return "q"
-        if c.lower() == "m":
-            return "m"
+        if c.lower() in ("m", "u", "r"):
+            return c.lower()
         if c.lower() in ("w", "a", "s", "d"):
             return c.lower()
         return ""
@@ -213,6 +232,27 @@ LEVEL_3 = [
 
 LEVELS = [LEVEL_1, LEVEL_2, LEVEL_3]
 
+def make_arena(rows, cols, n_enemies=0, n_gold=0, n_health=0, wall_density=0.08, seed=None):
+    """
+    Generate a walled rows x cols level (list of strings) with scattered walls,
+    @ top-left, G bottom-right and the given number of E / $ / +. For stress
+    tests and benchmarks; nothing guarantees G is reachable.
+    """
+    rng = random.Random(seed)
+    grid = [["#"] * cols for _ in range(rows)]
+    for r in range(1, rows - 1):
+        for c in range(1, cols - 1):
+            grid[r][c] = "#" if rng.random() < wall_density else "."
+    grid[1][1] = "@"
+    grid[rows - 2][cols - 2] = "G"
+    free = [(r, c) for r in range(1, rows - 1) for c in range(1, cols - 1) if grid[r][c] == "."]
+    rng.shuffle(free)
+    for ch, n in (("E", n_enemies), ("$", n_gold), ("+", n_health)):
+        for _ in range(min(n, len(free))):
+            r, c = free.pop()
+            grid[r][c] = ch
+    return ["".join(row) for row in grid]
+
 GOAL_CHAR = "G"
 ENEMY_CHAR = "E"
 HEALTH_CHAR = "+"
@@ -243,6 +283,240 @@ def _color_cell(c):
 def _draw_row(row):
     return "".join(_color_cell(c) for c in row)
 
+def _remembered_cell(c):
+    """Fog of war: a cell seen before but out of sight now. Terrain dimmed; E, = and @ not shown."""
+    if c in (ENEMY_CHAR, TRAIL_CHAR, PLAYER_CHAR):
+        c = FLOOR
+    return _D + c + _C
+
+# ---- Viewport camera ----
+# Maps bigger than the terminal show only the window around the player plus a
+# downsampled minimap; each frame then costs O(terminal), not O(map).
+MINIMAP_MAX = (10, 24)   # minimap rows, cols
+CAMERA_MARGIN = 4        # scroll once the player is this close to the window edge
+
+class Camera:
+    """
+    Follows one cell and renders the visible window of the grid. Rendered rows
+    are cached per grid row by (raw slice, marks), so unchanged rows cost one
+    slice compare per frame. The window only scrolls when the followed cell
+    nears its edge, keeping the cache valid while the player walks about.
+    """
+
+    def __init__(self, grid, hud_lines=8):
+        self.rows = len(grid)
+        self.cols = max((len(row) for row in grid), default=0)
+        self.hud_lines = hud_lines
+        self.top = self.left = 0
+        self.height, self.width = self.rows, self.cols
+        self.minimap = False
+        self._rows = {}          # grid row -> (left, raw slice, marks, rendered)
+        self._terrain = None     # downsampled walls, built once
+        self._seen_blocks = set()  # fog of war: minimap blocks with a seen cell
+
+    def _terminal(self):
+        try:
+            size = os.get_terminal_size()
+            return size.lines, size.columns
+        except OSError:
+            return 24, 80
+
+    def follow(self, r, c):
+        """Fit the window to the terminal and keep (r, c) inside it."""
+        lines, columns = self._terminal()
+        height = max(5, lines - self.hud_lines)
+        width = max(10, columns - 4)
+        self.minimap = self.rows > height or self.cols > width
+        if self.minimap:
+            width = max(10, width - MINIMAP_MAX[1] - 2)
+        self.height, self.width = min(height, self.rows), min(width, self.cols)
+        self.top = self._scroll(self.top, r, self.height, self.rows)
+        self.left = self._scroll(self.left, c, self.width, self.cols)
+
+    @staticmethod
+    def _scroll(start, pos, size, total):
+        margin = min(CAMERA_MARGIN, size // 4)
+        if pos < start + margin or pos >= start + size - margin:
+            start = pos - size // 2   # recentre
+        return max(0, min(start, total - size))
+
+    def _row(self, grid, r, marks):
+        """One rendered window row; marks maps column -> already coloured text."""
+        row = grid[r]
+        left, right = self.left, self.left + self.width
+        raw = "".join(row[left:right]) if isinstance(row, list) else row[left:right]
+        cached = self._rows.get(r)
+        if cached and cached[0] == left and cached[1] == raw and cached[2] == marks:
+            return cached[3]
+        if marks:
+            out = "".join(marks.get(c, None) or _color_cell(ch) for c, ch in enumerate(raw, left))
+        else:
+            out = _draw_row(raw)
+        self._rows[r] = (left, raw, marks, out)
+        return out
+
+    def _fog_row(self, grid, r, marks, fov):
+        """Window row under fog of war: in sight as usual, remembered dimmed, the rest blank."""
+        row = grid[r]
+        visible, seen = fov.visible, fov.seen
+        out = []
+        for c in range(self.left, min(self.left + self.width, len(row))):
+            if (r, c) in visible:
+                out.append((marks and marks.get(c)) or _color_cell(row[c]))
+            elif (r, c) in seen:
+                out.append(_remembered_cell(row[c]))
+            else:
+                out.append(" ")
+        return "".join(out)
+
+    def lines(self, grid, marks=None, goal=None, fov=None):
+        """
+        Rendered window rows, minimap alongside when the map does not fit.
+        marks: {(r, c): coloured text} drawn over the grid (Hero, Warden ...).
+        fov: a FieldOfView already updated for this frame (fog of war), or None.
+        """
+        by_row = {}
+        for (r, c), text in (marks or {}).items():
+            by_row.setdefault(r, {})[c] = text
+        rows = range(self.top, self.top + self.height)
+        if fov is None:
+            out = [self._row(grid, r, by_row.get(r)) for r in rows]
+        else:
+            out = [self._fog_row(grid, r, by_row.get(r), fov) for r in rows]
+        if self.minimap:
+            mini = self._minimap(grid, marks, goal if fov is None or goal in fov.seen else None, fov)
+            for i, line in enumerate(mini[:len(out)]):
+                pad = self.width - min(self.width, len(grid[self.top + i]) - self.left)
+                out[i] += " " * pad + "  " + line
+        return out
+
+    def _minimap(self, grid, marks, goal, fov=None):
+        if self._terrain is None:
+            bh = -(-self.rows // MINIMAP_MAX[0])
+            bw = -(-self.cols // MINIMAP_MAX[1])
+            sr, sc = max(1, bh // 8), max(1, bw // 8)   # at most 8x8 samples per block
+            terrain = []
+            for r0 in range(0, self.rows, bh):
+                line = []
+                for c0 in range(0, self.cols, bw):
+                    walls = total = 0
+                    for row in grid[r0:r0 + bh:sr]:
+                        block = row[c0:c0 + bw:sc]
+                        total += len(block)
+                        walls += sum(1 for ch in block if ch == WALL)
+                    line.append(WALL if total and walls * 2 > total else ".")
+                terrain.append(line)
+            self._terrain = (bh, bw, terrain)
+        bh, bw, terrain = self._terrain
+        if fov is None:
+            rows = [list(line) for line in terrain]
+        else:
+            # Fog of war: only blocks with a cell seen so far are drawn
+            for r, c in fov.fresh:
+                self._seen_blocks.add((r // bh, c // bw))
+            rows = [[ch if (i, j) in self._seen_blocks else " " for j, ch in enumerate(line)]
+                    for i, line in enumerate(terrain)]
+        if goal:
+            rows[goal[0] // bh][goal[1] // bw] = GOAL_CHAR
+        for (r, c), text in (marks or {}).items():
+            rows[r // bh][c // bw] = text
+        r0, r1 = self.top // bh, (self.top + self.height - 1) // bh
+        c0, c1 = self.left // bw, (self.left + self.width - 1) // bw
+        out = []
+        for i, line in enumerate(rows):
+            cells = []
+            for j, ch in enumerate(line):
+                if len(ch) > 1:
+                    cells.append(ch)              # already coloured mark
+                elif r0 <= i <= r1 and c0 <= j <= c1:
+                    cells.append("\033[7m" + ch + _C)  # inside the window: reverse video
+                else:
+                    cells.append(_color_cell(ch))
+            out.append("".join(cells))
+        return out
+
+# ---- Fog of war ----
+# Walls never move, so what is visible from a cell never changes: each cell's
+# shadowcast is computed once and kept in an LRU cache. E and = are drawn from
+# the live grid, so only the static walls go into the cache.
+FOV_RADIUS = 8
+FOV_CACHE_MAX = 4096   # cells whose visible set is kept
+# (xx, xy, yx, yy) transforms mapping the first octant onto each of the eight
+_OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+            (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+class FieldOfView:
+    """
+    Line of sight for fog of war. update(r, c) sets visible (cells in sight,
+    from the cache or one shadowcast) and adds them to seen (remembered cells);
+    fresh holds the cells seen for the first time by that update.
+    """
+
+    def __init__(self, grid, radius=FOV_RADIUS, cache_max=FOV_CACHE_MAX):
+        self.grid = grid
+        self.radius = radius
+        self.cache_max = cache_max
+        self.cache = OrderedDict()
+        self.visible = frozenset()
+        self.seen = set()
+        self.fresh = ()
+        self.stats = {"hits": 0, "casts": 0}
+
+    def update(self, r, c):
+        vis = self.cache.get((r, c))
+        if vis is None:
+            vis = self.cache[(r, c)] = self._cast(r, c)
+            self.stats["casts"] += 1
+            if len(self.cache) > self.cache_max:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end((r, c))
+            self.stats["hits"] += 1
+        self.visible = vis
+        self.fresh = vis - self.seen
+        self.seen |= self.fresh
+        return vis
+
+    def _cast(self, r0, c0):
+        """Recursive shadowcasting: every cell within radius with an unblocked line from (r0, c0)."""
+        out = {(r0, c0)}
+        for octant in _OCTANTS:
+            self._scan(r0, c0, 1, 1.0, 0.0, octant, out)
+        return frozenset(out)
+
+    def _scan(self, r0, c0, row, start, end, octant, out):
+        if start < end:
+            return
+        grid, radius = self.grid, self.radius
+        xx, xy, yx, yy = octant
+        r2 = radius * radius + radius  # round the circle's edge outward
+        next_start = start
+        for j in range(row, radius + 1):
+            blocked = False
+            dy = -j
+            for dx in range(-j, 1):
+                left, right = (dx - 0.5) / (dy + 0.5), (dx + 0.5) / (dy - 0.5)
+                if start < right:
+                    continue
+                if end > left:
+                    break
+                r, c = r0 + dx * yx + dy * yy, c0 + dx * xx + dy * xy
+                if dx * dx + dy * dy <= r2:
+                    out.add((r, c))
+                wall = get_cell(grid, r, c) == WALL
+                if blocked:
+                    if wall:
+                        next_start = right
+                    else:
+                        blocked = False
+                        start = next_start
+                elif wall and j < radius:
+                    blocked = True
+                    self._scan(r0, c0, j + 1, start, left, octant, out)
+                    next_start = right
+            if blocked:
+                break
+
 # High score: best = most gold, then fewest turns
 def _highscore_path():
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), "dungeon_highscore.txt")
@@ -287,98 +561,611 @@ def find_cells(grid, char):
     return out
 
 def get_cell(grid, r, c):
-    if 0 <= r < len(grid) and 0 <= c < len(grid[0]):
+    if 0 <= r < len(grid) and 0 <= c < len(grid[r]):
         return grid[r][c]
     return WALL
 
 def set_cell(grid, r, c, char):
-    if 0 <= r < len(grid) and 0 <= c < len(grid[0]):
+    if 0 <= r < len(grid) and 0 <= c < len(grid[r]):
+        if _cell_journal is not None and (r, c) not in _cell_journal:
+            _cell_journal[(r, c)] = grid[r][c]
         grid[r][c] = char
 
-def move_enemies(grid, enemies, pr, pc, tron=False):
-    """Enemies move; in Tron mode they leave trails and crash on trail/wall."""
+# ---- Undo / redo ----
+# (r, c) -> value before the first write this turn, while a History turn is open
+_cell_journal = None
+UNDO_MAX_CHANGES = 200_000   # cells + fields kept across all turns before the oldest are evicted
+
+def _list_delta(old, new):
+    """Index-wise changes between two lists of the same length, else the whole lists."""
+    if len(old) != len(new):
+        return None, tuple(old), tuple(new)
+    return tuple((i, a, b) for i, (a, b) in enumerate(zip(old, new)) if a != b), None, None
+
+class History:
+    """
+    Undo/redo for turn-based play. Each turn stores only what it changed:
+    (r, c, old, new) for every cell written through set_cell, plus the state
+    fields that differ (player position, HP, enemy moves...). Undo and redo
+    replay one record in O(changes); records are immutable and never copy the
+    grid. When the total stored changes pass max_changes the oldest turns go.
+    """
+
+    def __init__(self, max_changes=UNDO_MAX_CHANGES):
+        self.max_changes = max_changes
+        self.done = deque()   # records, oldest first
+        self.undone = []      # records available to redo, most recent last
+        self.changes = 0
+        self._before = None
+
+    def begin(self, state):
+        """Start a turn: remember state and journal set_cell writes until commit()."""
+        global _cell_journal
+        self._before = {k: (list(v) if isinstance(v, list) else v) for k, v in state.items()}
+        _cell_journal = {}
+
+    def commit(self, grid, state):
+        """End the turn started by begin() and push its record (clears redo)."""
+        global _cell_journal
+        journal, _cell_journal = _cell_journal or {}, None
+        cells = tuple((r, c, old, grid[r][c]) for (r, c), old in journal.items() if grid[r][c] != old)
+        fields = []
+        lists = []
+        for k, new in state.items():
+            old = self._before.get(k)
+            if isinstance(new, list):
+                delta = _list_delta(old, new)
+                if delta[0] != ():
+                    lists.append((k,) + delta)
+            elif old != new:
+                fields.append((k, old, new))
+        self._before = None
+        if not (cells or fields or lists):
+            return
+        record = (cells, tuple(fields), tuple(lists))
+        self.undone.clear()
+        self.done.append(record)
+        self.changes += self._size(record)
+        while self.changes > self.max_changes and len(self.done) > 1:
+            self.changes -= self._size(self.done.popleft())
+
+    def abort(self):
+        """Drop an open turn without recording it (e.g. the move was refused)."""
+        global _cell_journal
+        _cell_journal = None
+        self._before = None
+
+    @staticmethod
+    def _size(record):
+        cells, fields, lists = record
+        return len(cells) + len(fields) + sum(len(d) if d is not None else len(o) + len(n) for _, d, o, n in lists)
+
+    @staticmethod
+    def _apply(record, grid, state, forward):
+        cells, fields, lists = record
+        for r, c, old, new in cells:
+            grid[r][c] = new if forward else old
+        for k, old, new in fields:
+            state[k] = new if forward else old
+        for k, delta, old, new in lists:
+            if delta is None:
+                state[k][:] = new if forward else old
+            else:
+                for i, a, b in delta:
+                    state[k][i] = b if forward else a
+
+    def undo(self, grid, state):
+        """Roll grid and state back one turn. Returns False if there is nothing to undo."""
+        if not self.done:
+            return False
+        record = self.done.pop()
+        self.changes -= self._size(record)
+        self._apply(record, grid, state, forward=False)
+        self.undone.append(record)
+        return True
+
+    def redo(self, grid, state):
+        """Re-apply the last undone turn. Returns False if there is nothing to redo."""
+        if not self.undone:
+            return False
+        record = self.undone.pop()
+        self._apply(record, grid, state, forward=True)
+        self.done.append(record)
+        self.changes += self._size(record)
+        return True
+
+# ---- Tron enemy AI ----
+# Tron enemies take the move that leaves them the most room, then the one that
+# claims the most space near the player (Voronoi-style: cells they reach before
+# the player can). Open-region sizes live in TronSpace and are updated
+# incrementally: filling a cell only re-floods around that cell, and only when
+# the fill really cuts the region (see TronSpace._cuts). Region tracking is
+# exact; only move scoring is capped, so a step stays cheap on large maps.
+TRON_OPEN = (FLOOR, GOAL_CHAR, HEALTH_CHAR, GOLD_CHAR)
+TRON_ROOMY = 40           # regions at least this big count as "enough room"
+TRON_SPLIT_CAP = 64       # cells searched per side when checking if a move cuts a region
+TRON_STEP_BUDGET = 4000   # move-check cells per step, shared by every enemy (lowers the cap above)
+TRON_CONTEST_RADIUS = 4   # how far an enemy looks when contesting space with the player
+TRON_CONTEST_RANGE = 12   # only contest when the player is this close (Manhattan)
+_DIRS4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_RING = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+_EDGE = (-1, -1)          # stands for every cell off the map in TronSpace.wall
+
+def _ring_stretches(mask):
+    """
+    For the 8 cells around a cell (bit i set = _RING[i] open): one blocked
+    index per blocked stretch between the open runs that touch the center
+    (contain an orthogonal cell). Fewer than two: filling the center cuts nothing.
+    """
+    if mask == 0xFF:
+        return ()
+    start = next(i for i in range(8) if not mask >> i & 1)
+    out = []
+    rep, touching = start, False
+    for k in range(1, 9):
+        i = (start + k) % 8
+        if mask >> i & 1:
+            touching = touching or i % 2 == 1
+        elif touching:
+            out.append(rep)  # the stretch before this open run ends here
+            rep, touching = i, False
+    return tuple(out)
+
+_STRETCHES = tuple(_ring_stretches(mask) for mask in range(256))
+
+def _split_parts(is_open, starts, cap=None, limit=None):
+    """
+    Interleaved BFS from the open neighbors of a cell that was just filled.
+    Searches that meet are merged; the loop stops when at most one group is
+    still growing (or every growing group passed cap cells, or limit cells
+    were claimed in all). Returns (closed, growing, searched): closed = cell
+    sets of groups that ran out of cells without meeting anyone (regions cut
+    off), growing = groups left unfinished, searched = cells claimed.
+    Cost is O(size of the smaller parts), not O(region).
+    """
+    n = len(starts)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {s: i for i, s in enumerate(starts)}
+    size = [1] * n               # cells claimed, per group root
+    frontier = [deque([s]) for s in starts]
+    roots = set(range(n))        # groups not yet merged away or closed
+    closed = []
+    batch = 16 if cap is None else min(16, cap + 1)  # small caps: stop soon after passing them
+    while True:
+        for i in range(n):
+            f = frontier[i]
+            ri = find(i)
+            for _ in range(batch):  # expand in small batches to keep bookkeeping cheap
+                if not f:
+                    break
+                r, c = f.popleft()
+                for dr, dc in _DIRS4:
+                    q = (r + dr, c + dc)
+                    j = owner.get(q)
+                    if j is None:
+                        if is_open(q):
+                            owner[q] = i
+                            size[ri] += 1
+                            f.append(q)
+                    else:
+                        rj = find(j)
+                        if rj != ri:
+                            parent[rj] = ri
+                            size[ri] += size[rj]
+                            roots.discard(rj)
+        for g in list(roots):
+            if not any(frontier[i] for i in range(n) if find(i) == g):
+                closed.append({q for q, i in owner.items() if find(i) == g})
+                roots.discard(g)
+        if (len(roots) <= 1 or (cap is not None and all(size[g] > cap for g in roots))
+                or (limit is not None and len(owner) >= limit)):
+            return closed, len(roots), len(owner)
+
+class TronSpace:
+    """
+    Open-region labels and sizes for a Tron grid, kept current as cells fill in.
+    Cells only ever fill (undo rebuilds the whole TronSpace), so the blocked
+    cells are also kept as 8-connected groups in a union-find (wall), with
+    the map edge as one more group.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.label = {}   # (r, c) -> region id, open cells only
+        self.size = {}    # region id -> open cells in it
+        self.wall = {_EDGE: _EDGE}  # blocked (r, c) -> union-find parent
+        self.budget = None  # move-check cells left this step (None = unlimited)
+        self._next = 0
+        for r, row in enumerate(grid):
+            for c, ch in enumerate(row):
+                if ch in TRON_OPEN:
+                    if (r, c) not in self.label:
+                        self._flood((r, c))
+                else:
+                    self.wall[(r, c)] = (r, c)
+        for p in list(self.wall):
+            if p != _EDGE:
+                self._wall_join(p)
+
+    def _flood(self, start):
+        rid = self._new_region()
+        self.label[start] = rid
+        todo = [start]
+        count = 1
+        while todo:
+            r, c = todo.pop()
+            for dr, dc in _DIRS4:
+                q = (r + dr, c + dc)
+                if q not in self.label and get_cell(self.grid, q[0], q[1]) in TRON_OPEN:
+                    self.label[q] = rid
+                    todo.append(q)
+                    count += 1
+        self.size[rid] = count
+
+    def _new_region(self):
+        self._next += 1
+        return self._next
+
+    def _open_neighbors(self, p):
+        return [(p[0] + dr, p[1] + dc) for dr, dc in _DIRS4 if (p[0] + dr, p[1] + dc) in self.label]
+
+    def _search(self, is_open, starts, cap):
+        """Move check: _split_parts within what is left of this step's budget. Out of budget: nothing closes."""
+        if self.budget is None:
+            return _split_parts(is_open, starts, cap)[:2]
+        if self.budget <= 0:
+            return [], len(starts)
+        closed, growing, searched = _split_parts(is_open, starts, cap, self.budget)
+        self.budget -= searched
+        return closed, growing
+
+    def _wall_root(self, q):
+        wall = self.wall
+        if q not in wall:
+            if q in self.label:
+                return None
+            q = _EDGE
+        while wall[q] != q:
+            wall[q] = wall[wall[q]]
+            q = wall[q]
+        return q
+
+    def _wall_join(self, p):
+        """Union blocked p with every blocked cell (or the edge) around it."""
+        wall = self.wall
+        wall.setdefault(p, p)
+        root = self._wall_root(p)
+        for dr, dc in _RING:
+            other = self._wall_root((p[0] + dr, p[1] + dc))
+            if other is not None and other != root:
+                wall[other] = root
+
+    def _cuts(self, p):
+        """
+        True if filling p would split its region. Going round the 8 cells
+        around p, the open runs that touch p are separated by blocked
+        stretches; filling p closes a loop of blocked cells, and so cuts the
+        region, exactly when two different stretches are already one group.
+        """
+        r, c = p
+        label = self.label
+        mask = 0
+        for bit, (dr, dc) in enumerate(_RING):
+            if (r + dr, c + dc) in label:
+                mask |= 1 << bit
+        reps = _STRETCHES[mask]
+        if len(reps) < 2:
+            return False
+        roots = [self._wall_root((r + _RING[i][0], c + _RING[i][1])) for i in reps]
+        return len(set(roots)) < len(roots)
+
+    def block(self, r, c):
+        """(r, c) is no longer open (trail, enemy or player). Splits its region if needed."""
+        rid = self.label.pop((r, c), None)
+        if rid is None:
+            return
+        self.size[rid] -= 1
+        nbrs = self._open_neighbors((r, c))
+        if len(nbrs) >= 2 and self._cuts((r, c)):
+            closed, _, _ = _split_parts(self.label.__contains__, nbrs)
+            for cells in closed:
+                nid = self._new_region()
+                for q in cells:
+                    self.label[q] = nid
+                self.size[nid] = len(cells)
+                self.size[rid] -= len(cells)
+        self._wall_join((r, c))
+        if not self.size[rid]:
+            del self.size[rid]
+
+    def area_after(self, r, c, cap=TRON_SPLIT_CAP):
+        """Open cells still reachable from (r, c) once it is filled (best side if it splits)."""
+        p = (r, c)
+        base = self.size[self.label[p]] - 1
+        nbrs = self._open_neighbors(p)
+        if not nbrs:
+            return 0
+        if len(nbrs) < 2 or not self._cuts(p):
+            return base
+        closed, growing = self._search(lambda q: q != p and q in self.label, nbrs, cap)
+        if growing:
+            return base - sum(len(cells) for cells in closed)
+        return max(len(cells) for cells in closed)
+
+    def contest(self, r, c, pr, pc):
+        """Cells within TRON_CONTEST_RADIUS of (r, c) it reaches before the player (Manhattan bound)."""
+        seen = {(r, c)}
+        ring = [(r, c)]
+        won = 0
+        for d in range(TRON_CONTEST_RADIUS + 1):
+            nxt = []
+            for q in ring:
+                if d < abs(q[0] - pr) + abs(q[1] - pc):
+                    won += 1
+                for dr, dc in _DIRS4:
+                    n = (q[0] + dr, q[1] + dc)
+                    if n not in seen and n in self.label:
+                        seen.add(n)
+                        nxt.append(n)
+            ring = nxt
+        return won
+
+def _move_tron_enemies(grid, enemies, pr, pc, space):
+    """Tron enemies: hit an adjacent player, else take the roomiest move, else crash."""
     damage = 0
-    dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    valid_cells = (FLOOR, GOAL_CHAR, HEALTH_CHAR, GOLD_CHAR)
-    if tron:
-        # In Tron, trail blocks movement; enemies leave trail when they move
-        pass
-    to_remove = []  # indices of enemies that crashed (Tron only)
+    to_remove = []
+    player_regions = {space.label.get((pr + dr, pc + dc)) for dr, dc in _DIRS4}
+    cap = max(2, min(TRON_SPLIT_CAP, TRON_STEP_BUDGET // (4 * len(enemies) or 1)))
+    space.budget = TRON_STEP_BUDGET
     for i, (er, ec) in enumerate(enemies):
-        if tron:
-            # Enemy tries to move; if target is wall/trail they crash
-            random.shuffle(dirs)
-            moved = False
-            for dr, dc in dirs:
-                nr, nc = er + dr, ec + dc
-                cell = get_cell(grid, nr, nc)
-                if cell == PLAYER_CHAR:
-                    damage += 1
-                    moved = True
-                    break
-                if cell in valid_cells:
-                    set_cell(grid, er, ec, TRAIL_CHAR)
-                    set_cell(grid, nr, nc, ENEMY_CHAR)
-                    enemies[i] = (nr, nc)
-                    moved = True
-                    break
-                if cell in (WALL, TRAIL_CHAR):
-                    to_remove.append(i)
-                    set_cell(grid, er, ec, TRAIL_CHAR)
-                    moved = True
-                    break
-            if moved:
-                continue
-            # No direction was player/valid/wall - stay put (shouldn't happen often)
+        if abs(er - pr) + abs(ec - pc) == 1:
+            damage += 1
+            eventlog.emit("enemy_hit", at=[er, ec])
             continue
-        # Classic: 50% toward player, 50% random
-        if random.random() < 0.5:
-            toward = []
-            if pr != er:
-                toward.append((1 if pr > er else -1, 0))
-            if pc != ec:
-                toward.append((0, 1 if pc > ec else -1))
-            random.shuffle(toward)
-            for dr, dc in toward:
-                nr, nc = er + dr, ec + dc
-                cell = get_cell(grid, nr, nc)
-                if cell == PLAYER_CHAR:
-                    damage += 1
-                    break
-                if cell in valid_cells:
-                    set_cell(grid, er, ec, FLOOR)
-                    set_cell(grid, nr, nc, ENEMY_CHAR)
-                    enemies[i] = (nr, nc)
-                    break
-            else:
-                pass
+        near = abs(er - pr) + abs(ec - pc) <= TRON_CONTEST_RANGE
+        best = None
+        for dr, dc in _DIRS4:
+            nr, nc = er + dr, ec + dc
+            rid = space.label.get((nr, nc))
+            if rid is None:
+                continue
+            area = space.area_after(nr, nc, cap)
+            won = space.contest(nr, nc, pr, pc) if near and rid in player_regions else 0
+            key = (min(area, TRON_ROOMY), won, area, random.random())
+            if best is None or key > best[0]:
+                best = (key, nr, nc)
+        set_cell(grid, er, ec, TRAIL_CHAR)
+        if best is None:
+            to_remove.append(i)  # boxed in: crash into wall/trail
+            eventlog.emit("enemy_crash", at=[er, ec])
             continue
+        _, nr, nc = best
+        set_cell(grid, nr, nc, ENEMY_CHAR)
+        space.block(nr, nc)
+        enemies[i] = (nr, nc)
+    space.budget = None
+    for i in sorted(to_remove, reverse=True):
+        enemies.pop(i)
+    return damage
+
+# ---- Classic enemy pursuit ----
+# One BFS distance field from the player per turn, shared by every enemy: a
+# chasing enemy steps to any neighbor one closer, so walls no longer trap it.
+CLASSIC_CHASE = 0.5   # chance an enemy chases this turn; otherwise it wanders
+
+class FlowField:
+    """
+    BFS distances to the player over non-wall cells (walls are static in Classic).
+    Built with one full BFS; after that a one-cell player move is applied
+    incrementally. The grid graph is bipartite, so every distance changes by
+    exactly 1: cells whose shortest path to the old spot can run through the
+    new one get 1 closer, all others 1 farther. The "all others" part is a
+    shared offset, so only the cells behind the new spot are touched.
+    """
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = max((len(row) for row in grid), default=0)
+        n = self.rows * self.cols
+        self.nbrs = [()] * n
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if get_cell(grid, r, c) != WALL:
+                    self.nbrs[r * self.cols + c] = tuple(
+                        (r + dr) * self.cols + c + dc for dr, dc in _DIRS4
+                        if get_cell(grid, r + dr, c + dc) != WALL)
+        self.base = [0] * n       # distance = base[i] + offset
+        self.offset = 0
+        self.reach = bytearray(n)
+        self.mark = [0] * n
+        self._stamp = 0
+        self.source = None
+
+    def _rebuild(self, src):
+        base, nbrs, reach = self.base, self.nbrs, bytearray(len(self.base))
+        reach[src] = 1
+        base[src] = 0
+        queue = deque([src])
+        while queue:
+            u = queue.popleft()
+            du = base[u] + 1
+            for v in nbrs[u]:
+                if not reach[v]:
+                    reach[v] = 1
+                    base[v] = du
+                    queue.append(v)
+        self.reach = reach
+        self.offset = 0
+
+    def update(self, pr, pc):
+        """Re-root the field at the player: incremental for one-cell moves, full BFS otherwise."""
+        src = pr * self.cols + pc
+        old = self.source
+        self.source = src
+        if old == src:
+            return
+        if old is None or src not in self.nbrs[old]:
+            self._rebuild(src)
+            return
+        base, nbrs, mark = self.base, self.nbrs, self.mark
+        self._stamp += 1
+        stamp = self._stamp
+        mark[src] = stamp
+        behind = [src]
+        k = 0
+        while k < len(behind):
+            u = behind[k]
+            k += 1
+            bu = base[u] + 1
+            for v in nbrs[u]:
+                if base[v] == bu and mark[v] != stamp:
+                    mark[v] = stamp
+                    behind.append(v)
+        self.offset += 1
+        for u in behind:
+            base[u] -= 2
+
+    def distance(self, r, c):
+        """Steps from (r, c) to the player, or None if unreachable."""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        i = r * self.cols + c
+        return self.base[i] + self.offset if self.reach[i] else None
+
+    def downhill(self, r, c):
+        """Neighbors of (r, c) one step closer to the player."""
+        d = self.distance(r, c)
+        if not d:
+            return []
+        want = d - 1 - self.offset
+        return [divmod(v, self.cols) for v in self.nbrs[r * self.cols + c] if self.base[v] == want]
+
+def move_enemies(grid, enemies, pr, pc, tron=False, space=None, flow=None):
+    """
+    Enemies move; in Tron mode they leave trails and crash on trail/wall.
+    Pass the level's TronSpace (Tron) or FlowField (Classic) to reuse it across turns.
+    """
+    if tron:
+        return _move_tron_enemies(grid, enemies, pr, pc, space or TronSpace(grid))
+    flow = flow or FlowField(grid)
+    flow.update(pr, pc)
+    damage = 0
+    dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    valid_cells = (FLOOR, GOAL_CHAR, HEALTH_CHAR, GOLD_CHAR)
+    for i, (er, ec) in enumerate(enemies):
+        if random.random() < CLASSIC_CHASE:
+            steps = flow.downhill(er, ec)
+            if steps:
+                random.shuffle(steps)
+                for nr, nc in steps:
+                    cell = get_cell(grid, nr, nc)
+                    if cell == PLAYER_CHAR:
+                        damage += 1
+                        eventlog.emit("enemy_hit", at=[er, ec], chase=True)
+                        break
+                    if cell in valid_cells:
+                        set_cell(grid, er, ec, FLOOR)
+                        set_cell(grid, nr, nc, ENEMY_CHAR)
+                        enemies[i] = (nr, nc)
+                        break
+                continue  # blocked by another enemy: wait
         random.shuffle(dirs)
         for dr, dc in dirs:
             nr, nc = er + dr, ec + dc
             cell = get_cell(grid, nr, nc)
             if cell == PLAYER_CHAR:
                 damage += 1
+                eventlog.emit("enemy_hit", at=[er, ec], chase=False)
                 break
             if cell in valid_cells:
                 set_cell(grid, er, ec, FLOOR)
                 set_cell(grid, nr, nc, ENEMY_CHAR)
                 enemies[i] = (nr, nc)
                 break
-    for i in sorted(to_remove, reverse=True):
-        enemies.pop(i)
     return damage
 
-def run_level(level_num, grid, hp, score, gold, total_turns, mode=MODE_CLASSIC):
-    """Run one level. Returns (hp, score, gold, total_turns, won_level)."""
+def _player_step(grid, pr, pc, dr, dc, goal, enemies, hp, score, gold, tron=False):
+    """
+    Move the player one cell. Returns (pr, pc, hp, score, gold, outcome, msg).
+    outcome is "wall", "crash", "kill", "health", "gold" or "move"; on "wall" and
+    "crash" the player stays put. Kills are removed from enemies in place.
+    """
+    nr, nc = pr + dr, pc + dc
+    cell = get_cell(grid, nr, nc)
+
+    if cell == WALL:
+        if tron:
+            _play_sfx(sfx_crash)
+            eventlog.emit("crash", at=[nr, nc], into="wall")
+            return pr, pc, 0, score, gold, "crash", "CRASH! Hit wall."
+        _play_sfx(sfx_wall)
+        return pr, pc, hp, score, gold, "wall", "Blocked by wall."
+
+    if tron and cell == TRAIL_CHAR:
+        _play_sfx(sfx_crash)
+        eventlog.emit("crash", at=[nr, nc], into="trail")
+        return pr, pc, 0, score, gold, "crash", "CRASH! Hit trail."
+
+    # Leave trail (Tron) or clear cell (Classic)
+    if tron:
+        set_cell(grid, pr, pc, TRAIL_CHAR)
+    else:
+        set_cell(grid, pr, pc, GOAL_CHAR if (pr, pc) == goal else FLOOR)
+
+    if cell == ENEMY_CHAR:
+        _play_sfx(sfx_kill)
+        enemies[:] = [(r, c) for (r, c) in enemies if (r, c) != (nr, nc)]
+        set_cell(grid, nr, nc, FLOOR)
+        score += 1
+        hp -= 1
+        outcome, msg = "kill", "You killed an enemy! (-1 HP)"
+        eventlog.emit("kill", at=[nr, nc], hp=hp)
+    elif cell == HEALTH_CHAR:
+        _play_sfx(sfx_health)
+        set_cell(grid, nr, nc, FLOOR)
+        hp = min(MAX_HP, hp + 1)
+        outcome, msg = "health", f"Health +1 (now {hp}/{MAX_HP})"
+        eventlog.emit("pickup", item="health", at=[nr, nc], hp=hp)
+    elif cell == GOLD_CHAR:
+        _play_sfx(sfx_gold)
+        set_cell(grid, nr, nc, FLOOR)
+        gold += 1
+        outcome, msg = "gold", f"Gold +1 (total {gold})"
+        eventlog.emit("pickup", item="gold", at=[nr, nc], gold=gold)
+    else:
+        _play_sfx(sfx_move)
+        outcome, msg = "move", ""
+
+    set_cell(grid, nr, nc, PLAYER_CHAR)
+    return nr, nc, hp, score, gold, outcome, msg
+
+def run_level(level_num, grid, hp, score, gold, total_turns, mode=MODE_CLASSIC, fog=False):
+    """Run one level (fog: fog of war). Returns (hp, score, gold, total_turns, won_level)."""
     tron = mode == MODE_TRON
     start = find_cells(grid, PLAYER_CHAR)
     pr, pc = start[0] if start else (1, 1)
     goals = find_cells(grid, GOAL_CHAR)
     goal = goals[0] if goals else (len(grid) - 2, len(grid[0]) - 2)
     enemies = find_cells(grid, ENEMY_CHAR)
+    space = TronSpace(grid) if tron else None
+    flow = None if tron else FlowField(grid)
+    camera = Camera(grid)
+    fov = FieldOfView(grid) if fog else None
     turns = 0
     last_msg = ""
+    hist = History()
+
+    def state():
+        return {"pos": (pr, pc), "hp": hp, "score": score, "gold": gold, "turns": turns, "enemies": enemies}
+
+    eventlog.set_context(level=level_num)
 
     while True:
         clear_screen()
@@ -387,96 +1174,81 @@ def run_level(level_num, grid, hp, score, gold, total_turns, mode=MODE_CLASSIC):
         else:
             print(f"  CLASSIC   LEVEL {level_num + 1} / {len(LEVELS)}   Reach the G!")
         print()
-        for row in grid:
-            print(_draw_row(row))
+        camera.follow(pr, pc)
+        if fov:
+            fov.update(pr, pc)
+        for line in camera.lines(grid, {(pr, pc): _P + PLAYER_CHAR + _C}, goal, fov):
+            print(line)
         print()
         print(f"  HP: {hp}/{MAX_HP}   Kills: {score}   Gold: {gold}   Turn: {total_turns + turns}")
         if last_msg:
             print(f"  >> {last_msg}")
         print()
-        print("  Move: arrows or w/a/s/d   Mute: m   Quit: q")
+        print("  Move: arrows or w/a/s/d   Undo: u   Redo: r   Mute: m   Quit: q")
+        spectate.publish(mode, level_num, grid, hud={
+            "hp": hp, "kills": score, "gold": gold, "turn": total_turns + turns, "msg": last_msg})
 
         if (pr, pc) == goal:
             _play_sfx(sfx_goal)
+            eventlog.emit("level_clear", turns=turns, hp=hp, kills=score, gold=gold)
             return hp, score, gold, total_turns + turns, True
 
         if hp <= 0:
-            return hp, score, gold, total_turns + turns, False
-
-        move = get_key()
+            if not hist.done:
+                eventlog.emit("level_fail", reason="died", turns=turns)
+                return hp, score, gold, total_turns + turns, False
+            print("  You died!  u = undo last move, any other key = give up")
+            if get_key() != "u":
+                eventlog.emit("level_fail", reason="died", turns=turns)
+                return hp, score, gold, total_turns + turns, False
+            move = "u"
+        else:
+            move = get_key()
         if move == "q":
+            eventlog.emit("level_fail", reason="quit", turns=turns)
             return hp, score, gold, total_turns + turns, False
         if move == "m":
-            global _muted
-            _muted = not _muted
-            last_msg = "Sound muted." if _muted else "Sound on."
+            last_msg = _toggle_mute()
+            continue
+        if move in ("u", "r"):
+            st = state()
+            if not (hist.undo(grid, st) if move == "u" else hist.redo(grid, st)):
+                last_msg = "Nothing to undo." if move == "u" else "Nothing to redo."
+                continue
+            (pr, pc), hp, score, gold, turns = st["pos"], st["hp"], st["score"], st["gold"], st["turns"]
+            if tron:
+                space = TronSpace(grid)  # undo reopens cells; rebuild regions
+            last_msg = "Undone." if move == "u" else "Redone."
+            eventlog.emit("undo" if move == "u" else "redo", turns=turns)
             continue
 
-        dr, dc = 0, 0
-        if move in ("up", "w"): dr = -1
-        elif move in ("down", "s"): dr = 1
-        elif move in ("left", "a"): dc = -1
-        elif move in ("right", "d"): dc = 1
-        else:
+        if move not in KEY_DIRS:
             continue  # ignore other keys, just re-draw
+        dr, dc = KEY_DIRS[move]
 
-        nr, nc = pr + dr, pc + dc
-        cell = get_cell(grid, nr, nc)
-
-        if cell == WALL:
-            if tron:
-                _play_sfx(sfx_crash)
-                last_msg = "CRASH! Hit wall."
-                hp = 0
-            else:
-                _play_sfx(sfx_wall)
-                last_msg = "Blocked by wall."
+        hist.begin(state())
+        eventlog.emit("move", key=move, at=[pr, pc], turn=turns)
+        pr, pc, hp, score, gold, outcome, last_msg = _player_step(
+            grid, pr, pc, dr, dc, goal, enemies, hp, score, gold, tron
+        )
+        if outcome == "wall":
+            hist.abort()
             continue
-
-        if tron and cell == TRAIL_CHAR:
-            _play_sfx(sfx_crash)
-            last_msg = "CRASH! Hit trail."
-            hp = 0
+        if outcome == "crash":
+            hist.commit(grid, state())
             continue
-
-        # Leave trail (Tron) or clear cell (Classic)
         if tron:
-            set_cell(grid, pr, pc, TRAIL_CHAR)
-        else:
-            set_cell(grid, pr, pc, GOAL_CHAR if (pr, pc) == goal else FLOOR)
-
-        if cell == ENEMY_CHAR:
-            _play_sfx(sfx_kill)
-            enemies = [(r, c) for (r, c) in enemies if (r, c) != (nr, nc)]
-            set_cell(grid, nr, nc, FLOOR)
-            score += 1
-            hp -= 1
-            last_msg = "You killed an enemy! (-1 HP)"
-        elif cell == HEALTH_CHAR:
-            _play_sfx(sfx_health)
-            set_cell(grid, nr, nc, FLOOR)
-            hp = min(MAX_HP, hp + 1)
-            last_msg = f"Health +1 (now {hp}/{MAX_HP})"
-        elif cell == GOLD_CHAR:
-            _play_sfx(sfx_gold)
-            set_cell(grid, nr, nc, FLOOR)
-            gold += 1
-            last_msg = f"Gold +1 (total {gold})"
-        else:
-            _play_sfx(sfx_move)
-            last_msg = ""
-
-        pr, pc = nr, nc
-        set_cell(grid, pr, pc, PLAYER_CHAR)
+            space.block(pr, pc)
 
         turns += 1
-        dmg = move_enemies(grid, enemies, pr, pc, tron=tron)
+        dmg = move_enemies(grid, enemies, pr, pc, tron=tron, space=space, flow=flow)
         if dmg > 0:
             _play_sfx(sfx_hurt)
             hp -= dmg
             last_msg = f"Enemy hit you! (-{dmg} HP)"
         elif not last_msg:
             last_msg = "Moved." if not tron else "Moved. Trail left behind."
+        hist.commit(grid, state())
 
 def run():
     clear_screen()
@@ -506,7 +1278,16 @@ def run():
             return
         print("  Enter 1, 2, or 3.")
     print()
+    realtime = input("  Real-time (enemies move without waiting for you)? (y/n): ").strip().lower() == "y"
+    if realtime:
+        import realtime as rt
+        level_runner = rt.run_level_realtime
+    else:
+        level_runner = run_level
+    fog = input("  Fog of war (see only what is in line of sight)? (y/n): ").strip().lower() == "y"
+    print()
     input("  Press Enter to start...")
+    eventlog.new_game(mode, realtime=realtime, fog=fog)
 
     hp = 4
     score = 0
@@ -515,10 +1296,11 @@ def run():
 
     for level_num in range(len(LEVELS)):
         grid = [list(row) for row in LEVELS[level_num]]
-        hp, score, gold, total_turns, won = run_level(
-            level_num, grid, hp, score, gold, total_turns, mode
+        hp, score, gold, total_turns, won = level_runner(
+            level_num, grid, hp, score, gold, total_turns, mode, fog=fog
         )
         if not won:
+            eventlog.emit("game_end", won=False, reached=level_num, kills=score, gold=gold, turns=total_turns)
             clear_screen()
             if hp <= 0:
                 _play_sfx(sfx_gameover)
@@ -544,8 +1326,11 @@ def run():
             _play_sfx(sfx_goal)
             print(f"\n  *** LEVEL {level_num + 1} CLEAR ***")
             print(f"  HP: {hp}/{MAX_HP}   Kills: {score}   Gold: {gold}")
+            if realtime and rt.last_tick_stats:
+                print(f"  Tick: {rt.format_tick_stats(rt.last_tick_stats)}")
             input("\n  Press Enter for next level...")
 
+    eventlog.emit("game_end", won=True, reached=len(LEVELS) - 1, kills=score, gold=gold, turns=total_turns)
     clear_screen()
     _play_sfx(sfx_win)
     print("\n  *** YOU WON! ***")
@@ -563,5 +1348,18 @@ def run():
         print("  First run saved as best.")
     print()
 
+def _flag_value(flag):
+    """Value after --flag on the command line, or None when missing or another flag follows."""
+    i = sys.argv.index(flag)
+    value = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+    return None if value is None or value.startswith("--") else value
+
 if __name__ == "__main__":
+    if "--log" in sys.argv:
+        log = eventlog.start(_flag_value("--log"))
+        print(f"  Logging events to {log.directory}")
+    if "--spectate" in sys.argv:
+        srv = spectate.start(_flag_value("--spectate"))
+        print(f"  Spectators: http://{srv.host}:{srv.port}/?spectate")
+        input("  Press Enter to continue...")
     run()
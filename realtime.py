@@ -0,0 +1,336 @@
+"""
+Real-time mode for Classic and Tron.
+Enemies (and Tron trails) advance on a fixed tick from an asyncio loop instead of
+waiting for the player's key. Keys are read asynchronously; rendering is
+frame-budgeted and drops frames rather than letting the simulation fall behind.
+
+    python3 realtime.py --bench [rows cols enemies] [--tron] [--fog]   # headless tick-rate check
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+# Import shared helpers from main
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import eventlog
+import main
+import spectate
+from main import (
+    clear_screen, find_cells, get_key, move_enemies, make_arena,
+    _player_step, _toggle_mute, _play_sfx, _P, _C, Camera,
+    sfx_hurt, sfx_goal,
+    KEY_DIRS, LEVELS, MAX_HP, MODE_CLASSIC, MODE_TRON, TronSpace, FlowField, FieldOfView,
+    PLAYER_CHAR, GOAL_CHAR, ENEMY_CHAR,
+)
+
+TICK_HZ = 20                                  # simulation rate (10-30 is sensible)
+STEP_EVERY = {MODE_CLASSIC: 5, MODE_TRON: 3}  # ticks per enemy / trail step
+MAX_CATCHUP = 5                               # ticks run back-to-back before dropping lost time
+MAX_PENDING = 3                               # buffered Classic moves; extra presses are dropped
+
+# Stats of the most recent real-time level, for the between-levels screen
+last_tick_stats = None
+
+_ESC_KEYS = {"A": "up", "B": "down", "C": "right", "D": "left"}
+
+
+def _decode_keys(data):
+    """Split raw terminal input into get_key() names (up/down/left/right, w/a/s/d, q, m)."""
+    keys = []
+    i = 0
+    while i < len(data):
+        if data[i] == "\x1b" and data[i + 1:i + 2] == "[" and i + 2 < len(data):
+            name = _ESC_KEYS.get(data[i + 2])
+            if name:
+                keys.append(name)
+            i += 3
+            continue
+        ch = data[i].lower()
+        if ch in ("q", "m", "w", "a", "s", "d"):
+            keys.append(ch)
+        i += 1
+    return keys
+
+
+def _open_input(loop):
+    """
+    Start reading keys without blocking the loop. Returns (poll, close): poll()
+    drains the keys seen since the last call, close() restores the terminal.
+    """
+    if os.name == "nt":
+        import msvcrt
+
+        def poll():
+            keys = []
+            while msvcrt.kbhit():
+                k = get_key()
+                if k:
+                    keys.append(k)
+            return keys
+        return poll, lambda: None
+
+    buf = deque()
+    fd = sys.stdin.fileno()
+    old = None
+    if os.isatty(fd):
+        import termios
+        import tty
+        old = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+    def on_readable():
+        data = os.read(fd, 64)
+        if not data:
+            loop.remove_reader(fd)
+            return
+        buf.extend(_decode_keys(data.decode(errors="ignore")))
+
+    try:
+        loop.add_reader(fd, on_readable)
+        reading = True
+    except (OSError, ValueError, NotImplementedError):
+        reading = False  # e.g. stdin is a regular file: play on without input
+
+    def poll():
+        keys = list(buf)
+        buf.clear()
+        return keys
+
+    def close():
+        if reading:
+            loop.remove_reader(fd)
+        if old is not None:
+            import termios
+            termios.tcsetattr(fd, termios.TCSADRAIN, old)
+    return poll, close
+
+
+def _new_stats(hz):
+    return {"hz": hz, "ticks": 0, "total_ms": 0.0, "max_ms": 0.0, "overruns": 0,
+            "late": 0, "max_lag_ms": 0.0, "skipped": 0, "frames": 0, "dropped": 0}
+
+
+def _record_tick(stats, cost, lag, period):
+    """cost = seconds spent simulating the tick; lag = how late it started."""
+    stats["ticks"] += 1
+    stats["total_ms"] += cost * 1000
+    stats["max_ms"] = max(stats["max_ms"], cost * 1000)
+    stats["max_lag_ms"] = max(stats["max_lag_ms"], lag * 1000)
+    if cost > period:
+        stats["overruns"] += 1
+    if lag > period:
+        stats["late"] += 1
+
+
+def format_tick_stats(stats):
+    avg = stats["total_ms"] / stats["ticks"] if stats["ticks"] else 0.0
+    return (f"{stats['ticks']} ticks @ {stats['hz']} Hz   avg {avg:.2f} ms   max {stats['max_ms']:.2f} ms   "
+            f"overruns {stats['overruns']}   late {stats['late']} (max lag {stats['max_lag_ms']:.0f} ms)   "
+            f"skipped {stats['skipped']}   frames {stats['frames']}   dropped {stats['dropped']}")
+
+
+def _new_state(grid, hp, score, gold, tron=False, fog=False):
+    start = find_cells(grid, PLAYER_CHAR)
+    goals = find_cells(grid, GOAL_CHAR)
+    return {
+        "grid": grid,
+        "pos": start[0] if start else (1, 1),
+        "goal": goals[0] if goals else (len(grid) - 2, len(grid[0]) - 2),
+        "enemies": find_cells(grid, ENEMY_CHAR),
+        "space": TronSpace(grid) if tron else None,
+        "flow": None if tron else FlowField(grid),
+        "camera": Camera(grid, hud_lines=9),
+        "fov": FieldOfView(grid) if fog else None,
+        "hp": hp, "score": score, "gold": gold, "turns": 0,
+        "heading": None,      # Tron: direction the cycle keeps moving in
+        "pending": deque(),   # Classic: buffered moves, one applied per tick
+        "msg": "", "dirty": True, "done": False, "won": False,
+    }
+
+
+def _sim_tick(st, keys, tick, step_every, tron):
+    """Advance the simulation by one fixed tick."""
+    for k in keys:
+        if k == "q":
+            st["done"] = True
+            return
+        if k == "m":
+            st["msg"] = _toggle_mute()
+            st["dirty"] = True
+        elif k in KEY_DIRS:
+            d = KEY_DIRS[k]
+            if tron:
+                h = st["heading"]
+                if h is None or d != (-h[0], -h[1]):  # no 180° turns into your own trail
+                    st["heading"] = d
+            elif len(st["pending"]) < MAX_PENDING:
+                st["pending"].append(d)
+
+    step = tick % step_every == 0
+    move = None
+    if tron:
+        if step:
+            move = st["heading"]
+    elif st["pending"]:
+        move = st["pending"].popleft()
+
+    if move is not None:
+        pr, pc = st["pos"]
+        eventlog.emit("move", dir=list(move), at=[pr, pc], tick=tick)
+        pr, pc, st["hp"], st["score"], st["gold"], outcome, st["msg"] = _player_step(
+            st["grid"], pr, pc, move[0], move[1], st["goal"], st["enemies"],
+            st["hp"], st["score"], st["gold"], tron
+        )
+        st["pos"] = (pr, pc)
+        st["dirty"] = True
+        if outcome == "crash":
+            st["done"] = True
+            return
+        if outcome != "wall":
+            st["turns"] += 1
+            if tron:
+                st["space"].block(pr, pc)
+        if st["pos"] == st["goal"]:
+            _play_sfx(sfx_goal)
+            st["done"] = st["won"] = True
+            return
+
+    if step:
+        dmg = move_enemies(st["grid"], st["enemies"], st["pos"][0], st["pos"][1],
+                             tron=tron, space=st["space"], flow=st["flow"])
+        st["dirty"] = True
+        if dmg > 0:
+            _play_sfx(sfx_hurt)
+            st["hp"] -= dmg
+            st["msg"] = f"Enemy hit you! (-{dmg} HP)"
+
+    if st["hp"] <= 0:
+        st["done"] = True
+
+
+def _frame(st, level_num, tron, stats, total_turns):
+    """One full frame as a single string: cursor home, rows, HUD, clear the rest."""
+    if tron:
+        title = f"  TRON (real-time)   LEVEL {level_num + 1}/{len(LEVELS)}   = trail (don't touch!)   Reach G!"
+    else:
+        title = f"  CLASSIC (real-time)   LEVEL {level_num + 1} / {len(LEVELS)}   Reach the G!"
+    lines = [title, ""]
+    camera, fov = st["camera"], st["fov"]
+    camera.follow(*st["pos"])
+    if fov:
+        fov.update(*st["pos"])
+    lines.extend(camera.lines(st["grid"], {st["pos"]: _P + PLAYER_CHAR + _C}, st["goal"], fov))
+    lines.append("")
+    lines.append(f"  HP: {st['hp']}/{MAX_HP}   Kills: {st['score']}   Gold: {st['gold']}   "
+                 f"Turn: {total_turns + st['turns']}")
+    lines.append(f"  >> {st['msg']}" if st["msg"] else "")
+    lines.append(f"  {format_tick_stats(stats)}")
+    lines.append("  Move: arrows or w/a/s/d   Mute: m   Quit: q")
+    return "\033[H" + "\033[K\n".join(lines) + "\033[K\n\033[J"
+
+
+async def _tick_loop(st, level_num, tron, hz, step_every, poll, write, total_turns=0, max_ticks=None):
+    """
+    Fixed-timestep loop: the simulation runs exactly once per 1/hz seconds
+    (catching up to MAX_CATCHUP ticks when late); a frame is drawn only when the
+    state changed and the previous render cost fits before the next tick.
+    """
+    loop = asyncio.get_running_loop()
+    period = 1.0 / hz
+    stats = _new_stats(hz)
+    render_cost = 0.0
+    tick = 0
+    next_t = loop.time()
+    while not st["done"] and (max_ticks is None or tick < max_ticks):
+        now = loop.time()
+        ran = 0
+        while now >= next_t and ran < MAX_CATCHUP and not st["done"]:
+            t0 = time.perf_counter()
+            _sim_tick(st, poll(), tick, step_every, tron)
+            _record_tick(stats, time.perf_counter() - t0, now - next_t, period)
+            tick += 1
+            ran += 1
+            next_t += period
+            now = loop.time()
+        if now >= next_t:
+            # Still behind after catching up: give up the lost time instead of spiralling
+            skipped = int((now - next_t) / period) + 1
+            stats["skipped"] += skipped
+            next_t += skipped * period
+
+        if st["dirty"]:
+            if st["done"] or next_t - loop.time() >= render_cost:
+                t0 = time.perf_counter()
+                write(_frame(st, level_num, tron, stats, total_turns))
+                spectate.publish(MODE_TRON if tron else MODE_CLASSIC, level_num, st["grid"], hud={
+                    "hp": st["hp"], "kills": st["score"], "gold": st["gold"],
+                    "turn": total_turns + st["turns"], "msg": st["msg"]})
+                cost = time.perf_counter() - t0
+                render_cost = cost if not stats["frames"] else 0.8 * render_cost + 0.2 * cost
+                stats["frames"] += 1
+                st["dirty"] = False
+            else:
+                stats["dropped"] += 1
+        await asyncio.sleep(max(0.0, next_t - loop.time()))
+    return stats
+
+
+def _write_stdout(s):
+    sys.stdout.write(s)
+    sys.stdout.flush()
+
+
+def run_level_realtime(level_num, grid, hp, score, gold, total_turns, mode=MODE_CLASSIC, fog=False, hz=TICK_HZ):
+    """Real-time counterpart of run_level. Returns (hp, score, gold, total_turns, won_level)."""
+    global last_tick_stats
+    tron = mode == MODE_TRON
+    st = _new_state(grid, hp, score, gold, tron, fog)
+    if tron:
+        st["msg"] = "Pick a direction to start your cycle."
+
+    async def play():
+        poll, close = _open_input(asyncio.get_running_loop())
+        try:
+            return await _tick_loop(st, level_num, tron, hz, STEP_EVERY[mode], poll,
+                                    _write_stdout, total_turns)
+        finally:
+            close()
+
+    clear_screen()
+    eventlog.set_context(level=level_num)
+    last_tick_stats = asyncio.run(play())
+    if st["won"]:
+        eventlog.emit("level_clear", turns=st["turns"], hp=st["hp"], kills=st["score"], gold=st["gold"],
+                      ticks=last_tick_stats["ticks"])
+    else:
+        eventlog.emit("level_fail", reason="died" if st["hp"] <= 0 else "quit", turns=st["turns"],
+                      ticks=last_tick_stats["ticks"])
+    return st["hp"], st["score"], st["gold"], total_turns + st["turns"], st["won"]
+
+
+def bench(rows=200, cols=400, n_enemies=500, tron=False, hz=TICK_HZ, seconds=5.0, seed=1, fog=False):
+    """Run a generated arena headless (frames are built, not printed) and return tick stats."""
+    import random
+    rng = random.Random(seed)
+    main._muted = True
+    grid = [list(row) for row in make_arena(rows, cols, n_enemies, seed=seed)]
+    st = _new_state(grid, 10 ** 9, 0, 0, tron, fog)
+    keys = ["up", "down", "left", "right"]
+    mode = MODE_TRON if tron else MODE_CLASSIC
+
+    def poll():
+        return [rng.choice(keys)] if not tron and rng.random() < 0.5 else []
+
+    return asyncio.run(_tick_loop(st, 0, tron, hz, STEP_EVERY[mode], poll,
+                                  lambda s: None, max_ticks=int(seconds * hz)))
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        nums = [int(a) for a in sys.argv[1:] if a.isdigit()]
+        r, c, n = (nums + [200, 400, 500][len(nums):])[:3]
+        print(format_tick_stats(bench(r, c, n, tron="--tron" in sys.argv, fog="--fog" in sys.argv)))
+    else:
+        print("Play via main.py (choose Classic or Tron, then real-time).")
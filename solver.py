@@ -0,0 +1,219 @@
+"""
+Par-score solver for Classic: the best achievable run per level under the high
+score rule (_is_better_run: most gold, then fewest turns) and the route that
+gets it, as a move string you could type (w/a/s/d).
+
+Enemies wander at random, so the par ignores them: it is the best run on the
+level's walls, gold and goal alone. Without enemies HP never limits a route and
++ only costs turns, so the search state is (position, gold collected). Reaching
+G ends the level, so routes never pass through G early.
+
+Pairwise BFS distances between start, every $ and G, then A* over
+(gold bitmask, last gold) with an admissible bound: the nearest remaining stop
+plus a minimum spanning tree over the remaining gold and G (memoized per mask).
+
+    python3 solver.py                       # par for each level in LEVELS
+    python3 solver.py --arena 60x120 --gold 24 --seed 3
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import (
+    make_arena, find_cells, _player_step, _load_highscore, _is_better_run,
+    LEVELS, WALL, FLOOR, PLAYER_CHAR, GOAL_CHAR, GOLD_CHAR, ENEMY_CHAR,
+)
+
+_STEPS = ((-1, 0, "w"), (1, 0, "s"), (0, -1, "a"), (0, 1, "d"))
+_INF = float("inf")
+
+
+def _bfs(grid, start, goal):
+    """Distances and parent links from start. G is a target only: paths never continue through it."""
+    dist = {start: 0}
+    parent = {}
+    queue = [start]
+    for cell in queue:
+        if cell == goal and cell != start:
+            continue
+        r, c = cell
+        for dr, dc, key in _STEPS:
+            q = (r + dr, c + dc)
+            if q in dist or not (0 <= q[0] < len(grid) and 0 <= q[1] < len(grid[q[0]])):
+                continue
+            if grid[q[0]][q[1]] == WALL:
+                continue
+            dist[q] = dist[cell] + 1
+            parent[q] = (cell, key)
+            queue.append(q)
+    return dist, parent
+
+
+def _keys(parent, start, end):
+    out = []
+    while end != start:
+        end, key = parent[end]
+        out.append(key)
+    return "".join(reversed(out))
+
+
+def _mst(nodes, dist):
+    """Prim's MST weight over nodes (indices into dist)."""
+    if len(nodes) < 2:
+        return 0
+    best = {n: dist[nodes[0]][n] for n in nodes[1:]}
+    total = 0
+    while best:
+        n = min(best, key=best.get)
+        total += best.pop(n)
+        row = dist[n]
+        for m in best:
+            if row[m] < best[m]:
+                best[m] = row[m]
+    return total
+
+
+def solve(level):
+    """
+    Best (gold, turns) for one level (list of strings) and its route.
+    Returns {"gold", "turns", "route", "unreachable_gold", "expanded", "seconds"},
+    or None when G cannot be reached.
+    """
+    t0 = time.perf_counter()
+    grid = [list(row) for row in level]
+    start = find_cells(grid, PLAYER_CHAR)[0]
+    goal = find_cells(grid, GOAL_CHAR)[0]
+    sdist, _ = _bfs(grid, start, goal)
+    if goal not in sdist:
+        return None
+    # Gold you cannot reach without passing G does not count; neither does gold you could not leave
+    golds = [g for g in find_cells(grid, GOLD_CHAR) if g in sdist]
+    bfs = [_bfs(grid, g, goal) for g in golds]
+    golds_ok = [i for i, (d, _) in enumerate(bfs) if goal in d]
+    unreachable = len(find_cells(grid, GOLD_CHAR)) - len(golds_ok)
+    golds = [golds[i] for i in golds_ok]
+    bfs = [bfs[i] for i in golds_ok]
+    n = len(golds)
+    g_idx = n
+    # dist[i][j] between gold i / G (index n); from_start[j] from the start
+    dist = [[d.get(p, _INF) for p in golds] + [d[goal]] for d, _ in bfs]
+    dist.append([row[g_idx] for row in dist] + [0])  # grid moves are reversible: G's row mirrors its column
+    from_start = [sdist[p] for p in golds] + [sdist[goal]]
+    full = (1 << n) - 1
+    mst_memo = {}
+
+    def bound(mask, i):
+        """Lower bound on the turns left after collecting mask, standing on gold i (-1 = start)."""
+        left = [j for j in range(n) if not mask >> j & 1] + [g_idx]
+        row = from_start if i < 0 else dist[i]
+        tree = mst_memo.get(mask)
+        if tree is None:
+            tree = mst_memo[mask] = _mst(left, dist)
+        return min(row[j] for j in left) + tree
+
+    # A*: entries (f, g, mask, i); i = n means "at G, done"
+    heap = [(bound(0, -1), 0, 0, -1)]
+    best_g = {(0, -1): 0}
+    came = {}
+    expanded = 0
+    while heap:
+        f, g, mask, i = heapq.heappop(heap)
+        if i == g_idx:
+            break
+        if best_g.get((mask, i), _INF) < g:
+            continue
+        expanded += 1
+        row = from_start if i < 0 else dist[i]
+        if mask == full:
+            nxt = [(g_idx, mask)]
+        else:
+            nxt = [(j, mask | 1 << j) for j in range(n) if not mask >> j & 1]
+        for j, m2 in nxt:
+            g2 = g + row[j]
+            if g2 >= best_g.get((m2, j), _INF):
+                continue
+            best_g[(m2, j)] = g2
+            came[(m2, j)] = (mask, i)
+            heapq.heappush(heap, (g2 + (0 if j == g_idx else bound(m2, j)), g2, m2, j))
+
+    # Route: gold order back from the finishing state, then the BFS paths between stops
+    order = []
+    state = (full, g_idx)
+    while state != (0, -1):
+        order.append(state[1])
+        state = came[state]
+    order.reverse()
+    route = []
+    at, parent = start, _bfs(grid, start, goal)[1]
+    for j in order:
+        target = goal if j == g_idx else golds[j]
+        route.append(_keys(parent, at, target))
+        if j != g_idx:
+            at, parent = golds[j], bfs[j][1]
+    return {"gold": n, "turns": g, "route": "".join(route), "unreachable_gold": unreachable,
+            "expanded": expanded, "seconds": time.perf_counter() - t0}
+
+
+def replay(level, route):
+    """Play route with _player_step on the level minus its enemies. Returns (gold, turns, reached G)."""
+    import main
+    main._muted = True
+    grid = [[FLOOR if ch == ENEMY_CHAR else ch for ch in row] for row in level]
+    pr, pc = find_cells(grid, PLAYER_CHAR)[0]
+    goal = find_cells(grid, GOAL_CHAR)[0]
+    hp, score, gold, turns = 4, 0, 0, 0
+    dirs = {key: (dr, dc) for dr, dc, key in _STEPS}
+    for key in route:
+        if (pr, pc) == goal:
+            break
+        pr, pc, hp, score, gold, outcome, _ = _player_step(grid, pr, pc, *dirs[key], goal, [], hp, score, gold)
+        turns += outcome != "wall"
+    return gold, turns, (pr, pc) == goal
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Par (max gold, then min turns) and route for Classic levels.")
+    ap.add_argument("--arena", metavar="ROWSxCOLS", help="solve a generated arena instead of LEVELS")
+    ap.add_argument("--gold", type=int, default=20, help="gold in the generated arena")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.arena:
+        h, w = (int(x) for x in args.arena.lower().split("x"))
+        levels = [(f"arena {args.arena} seed {args.seed}",
+                   make_arena(h, w, n_gold=args.gold, wall_density=0.2, seed=args.seed))]
+    else:
+        levels = [(f"Level {i + 1}", level) for i, level in enumerate(LEVELS)]
+
+    total_gold = total_turns = 0
+    for name, level in levels:
+        res = solve(level)
+        if res is None:
+            print(f"  {name}: G is unreachable")
+            return 1
+        gold, turns, reached = replay(level, res["route"])
+        ok = reached and (gold, turns) == (res["gold"], res["turns"])
+        total_gold += res["gold"]
+        total_turns += res["turns"]
+        print(f"  {name}: par {res['gold']} gold in {res['turns']} turns"
+              + (f"   ({res['unreachable_gold']} gold unreachable)" if res["unreachable_gold"] else "")
+              + f"   [{res['expanded']} states, {res['seconds'] * 1000:.0f} ms"
+              + ("" if ok else f", REPLAY MISMATCH: {gold} gold {turns} turns") + "]")
+        print(f"    {res['route']}")
+    if not args.arena:
+        print(f"  Full run par: {total_gold} gold in {total_turns} turns")
+        best = _load_highscore()
+        if best:
+            bg, bt = best
+            if _is_better_run(bg, bt, total_gold, total_turns):
+                print(f"  Recorded best {bg} gold / {bt} turns beats par: check the high score file.")
+            else:
+                print(f"  Recorded best: {bg} gold / {bt} turns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Spectator broadcast: stream live Classic / Tron / Blind Duel games to index.html viewers.
+The game publishes a frame after each draw; frames are delta-encoded (changed cells,
+moved entities, changed HUD fields) with a full keyframe every KEYFRAME_EVERY frames,
+serialized once and written to every viewer as Server-Sent Events.
+
+    python3 main.py --spectate [host:]port       # play and stream (default 127.0.0.1:8765)
+    open http://host:port/?spectate               # watch
+    python3 spectate.py --bench [viewers frames]  # fan-out cost with local viewers
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+KEYFRAME_EVERY = 50          # frames between full keyframes
+MAX_CLIENT_BUFFER = 1 << 20  # bytes queued for one viewer before it is dropped as too slow
+DEFAULT_PORT = 8765
+
+_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
+
+
+def _sse(seq, msg):
+    """One SSE event, encoded once and shared by every viewer."""
+    return b"id: %d\ndata: %s\n\n" % (seq, json.dumps(msg, separators=(",", ":")).encode())
+
+
+class _DeltaEncoder:
+    """Remembers the last frame and turns the next one into a keyframe or a delta."""
+
+    def __init__(self):
+        self.seq = 0
+        self.mode = None
+        self.level = None
+        self.rows = None
+        self.ents = {}
+        self.hud = {}
+
+    def keyframe(self):
+        return {"t": "k", "seq": self.seq, "mode": self.mode, "level": self.level,
+                "rows": list(self.rows), "ents": self.ents, "hud": self.hud}
+
+    def encode(self, mode, level, rows, ents, hud):
+        key = (self.rows is None or mode != self.mode or level != self.level
+               or len(rows) != len(self.rows) or self.seq % KEYFRAME_EVERY == KEYFRAME_EVERY - 1)
+        if key:
+            msg = None
+        else:
+            cells = []
+            for r, (old, new) in enumerate(zip(self.rows, rows)):
+                if old == new:
+                    continue
+                if len(old) != len(new):
+                    cells.append([r, -1, new])  # whole row
+                    continue
+                for c, ch in enumerate(new):
+                    if old[c] != ch:
+                        cells.append([r, c, ch])
+            msg = {"t": "d", "seq": self.seq + 1}
+            if cells:
+                msg["cells"] = cells
+            moved = {k: v for k, v in ents.items() if self.ents.get(k) != v}
+            if moved:
+                msg["ents"] = moved
+            gone = [k for k in self.ents if k not in ents]
+            if gone:
+                msg["gone"] = gone
+            changed = {k: v for k, v in hud.items() if self.hud.get(k) != v}
+            if changed:
+                msg["hud"] = changed
+        self.seq += 1
+        self.mode, self.level, self.rows, self.ents, self.hud = mode, level, rows, ents, hud
+        return self.keyframe() if key else msg
+
+
+class Broadcaster:
+    """SSE server on its own asyncio loop; publish() is safe to call from the game thread."""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.clients = set()
+        self.encoder = _DeltaEncoder()
+        self.loop = None
+        self.server = None
+        self._key_cache = (None, b"")
+        self.stats = {"frames": 0, "bytes": 0, "writes": 0, "dropped_clients": 0, "fanout_s": 0.0}
+
+    # ---- game side ----
+    def publish(self, mode, level, grid, ents=None, hud=None):
+        rows = tuple(row if isinstance(row, str) else "".join(row) for row in grid)
+        ents = {k: list(v) for k, v in (ents or {}).items()}
+        self.loop.call_soon_threadsafe(self._broadcast, mode, level, rows, ents, dict(hud or {}))
+
+    # ---- loop side ----
+    def _broadcast(self, mode, level, rows, ents, hud):
+        t0 = time.perf_counter()
+        msg = self.encoder.encode(mode, level, rows, ents, hud)
+        data = _sse(self.encoder.seq, msg)
+        if msg["t"] == "k":
+            self._key_cache = (self.encoder.seq, data)
+        for w in list(self.clients):
+            if w.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                self._drop(w)
+                continue
+            w.write(data)
+        self.stats["frames"] += 1
+        self.stats["bytes"] += len(data)
+        self.stats["writes"] += len(self.clients)
+        self.stats["fanout_s"] += time.perf_counter() - t0
+
+    def _keyframe_bytes(self):
+        """Current state as a keyframe, built at most once per frame however many viewers join."""
+        seq = self.encoder.seq
+        if self._key_cache[0] != seq:
+            self._key_cache = (seq, _sse(seq, self.encoder.keyframe()))
+        return self._key_cache[1]
+
+    def _drop(self, w):
+        self.clients.discard(w)
+        self.stats["dropped_clients"] += 1
+        w.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        parts = head.split(b" ", 2)
+        path = parts[1].decode(errors="ignore") if len(parts) > 1 else "/"
+        if path.startswith("/events"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\n\r\n")
+            if self.encoder.rows is not None:
+                writer.write(self._keyframe_bytes())
+            self.clients.add(writer)
+            try:
+                await reader.read()  # viewers never send; returns when they disconnect
+            except ConnectionError:
+                pass
+            self.clients.discard(writer)
+            writer.close()
+            return
+        if path == "/" or path.startswith("/?") or path.startswith("/index.html"):
+            with open(_INDEX_PATH, "rb") as f:
+                body = f.read()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                         b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+        else:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def start_thread(self):
+        """Run the server on a daemon thread; returns once it is listening."""
+        ready = threading.Event()
+
+        def target():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.serve())
+            ready.set()
+            loop.run_forever()
+        threading.Thread(target=target, name="spectate", daemon=True).start()
+        ready.wait()
+        return self
+
+
+# The running broadcaster, if any. Kept here (not in main) so every module sees the same one.
+_server = None
+
+
+def start(addr=None):
+    """Start broadcasting on '[host:]port' (default 127.0.0.1:8765). Returns the Broadcaster."""
+    global _server
+    host, port = "127.0.0.1", DEFAULT_PORT
+    if addr:
+        if ":" in addr:
+            host, _, p = addr.rpartition(":")
+            port = int(p)
+        else:
+            port = int(addr)
+    _server = Broadcaster(host, port).start_thread()
+    return _server
+
+
+def publish(mode, level, grid, ents=None, hud=None):
+    """Send one frame to viewers; a no-op unless start() was called."""
+    if _server is not None:
+        _server.publish(mode, level, grid, ents, hud)
+
+
+async def _bench(n_viewers, n_frames, rows, cols, n_enemies):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import main
+    main._muted = True
+    b = Broadcaster("127.0.0.1", 0)
+    await b.serve()
+    grid = [list(row) for row in main.make_arena(rows, cols, n_enemies, seed=1)]
+    enemies = main.find_cells(grid, main.ENEMY_CHAR)
+    b._broadcast("classic", 0, tuple("".join(r) for r in grid), {}, {"hp": 4})
+
+    received = [0] * n_viewers
+    conns = []
+
+    async def viewer(i):
+        reader, writer = await asyncio.open_connection("127.0.0.1", b.port)
+        conns.append(writer)
+        writer.write(b"GET /events HTTP/1.1\r\nHost: bench\r\n\r\n")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"data:"):
+                received[i] += 1
+    tasks = [asyncio.ensure_future(viewer(i)) for i in range(n_viewers)]
+    while len(b.clients) < n_viewers:
+        await asyncio.sleep(0.01)
+
+    b.stats.update(frames=0, bytes=0, writes=0, fanout_s=0.0)
+    worst = 0.0
+    t_start = time.perf_counter()
+    for f in range(n_frames):
+        main.move_enemies(grid, enemies, 1, 1)
+        snap = tuple("".join(r) for r in grid)
+        t0 = time.perf_counter()
+        b._broadcast("classic", 0, snap, {}, {"hp": 4, "turn": f})
+        worst = max(worst, time.perf_counter() - t0)
+        await asyncio.sleep(0)
+    while min(received) < n_frames + 1 and time.perf_counter() - t_start < 30:
+        await asyncio.sleep(0.01)
+    total = time.perf_counter() - t_start
+    for w in conns:
+        w.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    while b.clients:
+        await asyncio.sleep(0.01)
+    b.server.close()
+    await b.server.wait_closed()
+    s = b.stats
+    per_frame = s["fanout_s"] / max(1, s["frames"]) * 1e6
+    print(f"{n_viewers} viewers, {s['frames']} frames ({rows}x{cols}, {n_enemies} enemies)")
+    print(f"  avg frame {s['bytes'] / max(1, s['frames']):.0f} B   "
+          f"fan-out avg {per_frame:.0f} us / frame ({per_frame / max(1, n_viewers):.2f} us / viewer)   "
+          f"max {worst * 1e6:.0f} us")
+    print(f"  all frames delivered to all viewers in {total:.2f} s   "
+          f"min received {min(received)}   dropped viewers {s['dropped_clients']}")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        nums = [int(a) for a in sys.argv[1:] if a.isdigit()]
+        viewers, frames = (nums + [300, 200][len(nums):])[:2]
+        asyncio.run(_bench(viewers, frames, 60, 120, 100))
+    else:
+        print(__doc__)
@@ -0,0 +1,265 @@
+"""
+Level validator and difficulty analyzer for LEVELS, BLIND_DUEL_LEVELS and custom maps.
+Checks that rows are rectangular, that G and every pickup are reachable from the start,
+and for Blind Duel the Hero-vs-Warden distance margins. Reports shortest path length and choke cells (cells every start-to-goal path
+must cross). Levels are checked across a process pool; the report is JSON.
+
+    python3 validate_levels.py                          # shipped levels
+    python3 validate_levels.py maps.txt ...             # level files, blank-line separated
+    python3 validate_levels.py --generate 5000 --size 20x40 --out report.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from main import (
+    make_arena, LEVELS,
+    WALL, GOAL_CHAR, PLAYER_CHAR, ENEMY_CHAR, HEALTH_CHAR, GOLD_CHAR,
+)
+
+WARDEN_CHAR = "W"
+_OPEN = bytes(0 if chr(i) == WALL else 1 for i in range(256))   # byte -> passable?
+
+
+class _Flat:
+    """
+    The level as one padded bytearray (a wall border all round), so BFS and DFS
+    work on integer indices with fixed neighbor offsets instead of (r, c) tuples.
+    """
+
+    def __init__(self, rows, width):
+        self.w = width + 2
+        cells = bytearray(self.w * (len(rows) + 2))
+        for r, row in enumerate(rows):
+            i = (r + 1) * self.w + 1
+            line = row.encode("latin-1", "replace").translate(_OPEN)
+            cells[i:i + len(line)] = line
+        self.open = cells
+        self.steps = (-self.w, self.w, -1, 1)
+
+    def index(self, r, c):
+        return (r + 1) * self.w + c + 1
+
+    def cell(self, i):
+        return divmod(i, self.w)[0] - 1, i % self.w - 1
+
+    def bfs(self, start):
+        """Distances from start (-1 = unreachable)."""
+        open_, steps = self.open, self.steps
+        dist = [-1] * len(open_)
+        dist[start] = 0
+        queue = [start]
+        for u in queue:
+            du = dist[u] + 1
+            for s in steps:
+                v = u + s
+                if open_[v] and dist[v] < 0:
+                    dist[v] = du
+                    queue.append(v)
+        return dist
+
+    def chokes(self, start, goal, dist):
+        """
+        Cells (other than start and goal) that lie on every start-to-goal path.
+        One iterative DFS from start computes low-links; walking the DFS tree up
+        from goal, an ancestor v is a choke when the child subtree holding goal
+        has no back edge above v (low[child] >= disc[v]).
+        """
+        n = len(self.open)
+        steps = self.steps
+        disc = [-1] * n
+        low = [0] * n
+        parent = [-1] * n
+        nxt = [0] * n        # next neighbor offset to try, per vertex on the stack
+        disc[start] = 0
+        count = 1
+        stack = [start]
+        while stack:
+            v = stack[-1]
+            k = nxt[v]
+            if k < 4:
+                nxt[v] = k + 1
+                w = v + steps[k]
+                if dist[w] < 0:
+                    continue
+                if disc[w] < 0:
+                    disc[w] = low[w] = count
+                    count += 1
+                    parent[w] = v
+                    stack.append(w)
+                elif w != parent[v] and disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+            stack.pop()
+            p = parent[v]
+            if p >= 0 and low[v] < low[p]:
+                low[p] = low[v]
+        out = []
+        child, v = goal, parent[goal]
+        while v >= 0 and v != start:
+            if low[child] >= disc[v]:
+                out.append(v)
+            child, v = v, parent[v]
+        return out[::-1]
+
+
+def _find(rows, chars):
+    """Positions of each char of interest, in one pass per char over the row strings."""
+    out = {ch: [] for ch in chars}
+    for r, row in enumerate(rows):
+        for ch in chars:
+            c = row.find(ch)
+            while c >= 0:
+                out[ch].append((r, c))
+                c = row.find(ch, c + 1)
+    return out
+
+
+def analyze(rows, name=""):
+    """Validate one level (list of strings). Returns a JSON-ready report dict."""
+    found = _find(rows, (PLAYER_CHAR, GOAL_CHAR, WARDEN_CHAR, HEALTH_CHAR, GOLD_CHAR, ENEMY_CHAR))
+    wardens = found[WARDEN_CHAR]
+    blind = bool(wardens)
+    errors, warnings = [], []
+    widths = [len(row) for row in rows]
+    width = max(widths, default=0)
+    ragged = [r for r, w in enumerate(widths) if w != widths[0]] if rows else []
+    report = {
+        "name": name,
+        "kind": "blind_duel" if blind else "classic",
+        "size": [len(rows), width],
+        "rectangular": not ragged,
+        "ragged_rows": ragged,
+    }
+    if ragged:
+        errors.append(f"ragged rows {ragged} (row 0 is {widths[0]} wide)")
+
+    starts, goals = found[PLAYER_CHAR], found[GOAL_CHAR]
+    if len(starts) != 1:
+        errors.append(f"expected one {PLAYER_CHAR}, found {len(starts)}")
+    if len(goals) != 1:
+        errors.append(f"expected one {GOAL_CHAR}, found {len(goals)}")
+    if blind and len(wardens) != 1:
+        errors.append(f"expected one {WARDEN_CHAR}, found {len(wardens)}")
+
+    health, gold = found[HEALTH_CHAR], found[GOLD_CHAR]
+    report["pickups"] = {"health": len(health), "gold": len(gold)}
+    report["enemies"] = len(found[ENEMY_CHAR])
+    if not starts or not goals:
+        report.update(ok=False, errors=errors, warnings=warnings)
+        return report
+
+    flat = _Flat(rows, width)
+    start, goal = flat.index(*starts[0]), flat.index(*goals[0])
+    dist = flat.bfs(start)
+    report["open_cells"] = sum(flat.open)
+    report["reachable_cells"] = len(dist) - dist.count(-1)
+    report["shortest_path"] = dist[goal] if dist[goal] >= 0 else None
+    if dist[goal] < 0:
+        errors.append(f"{GOAL_CHAR} at {list(goals[0])} is unreachable from {PLAYER_CHAR}")
+        report["chokes"] = None
+    else:
+        chokes = flat.chokes(start, goal, dist)
+        report["chokes"] = len(chokes)
+        report["choke_cells"] = [list(flat.cell(i)) for i in chokes]
+    lost = [[r, c, rows[r][c]] for r, c in health + gold if dist[flat.index(r, c)] < 0]
+    if lost:
+        errors.append(f"unreachable pickups {lost}")
+    report["pickups"]["unreachable"] = lost
+
+    if blind and wardens:
+        w = flat.index(*wardens[0])
+        wdist = flat.bfs(w)
+        hero_to_goal = report["shortest_path"]
+        warden_to_goal = wdist[goal] if wdist[goal] >= 0 else None
+        report["hero_to_warden"] = dist[w] if dist[w] >= 0 else None
+        report["warden_to_goal"] = warden_to_goal
+        if hero_to_goal is not None and warden_to_goal is not None:
+            margin = warden_to_goal - hero_to_goal
+            report["goal_margin"] = margin
+            if margin <= 0:
+                warnings.append(f"Warden reaches {GOAL_CHAR} no later than Hero (margin {margin})")
+        if report["hero_to_warden"] is not None and report["hero_to_warden"] <= 2:
+            warnings.append("Warden can tag Hero on the first turn")
+
+    report.update(ok=not errors, errors=errors, warnings=warnings)
+    return report
+
+
+def _check(item):
+    """Worker entry: item is (name, rows) or (name, ("arena", rows, cols, seed))."""
+    name, rows = item
+    if isinstance(rows, tuple):
+        _, h, w, seed = rows
+        rows = make_arena(h, w, n_enemies=h * w // 80, n_gold=6, n_health=3, wall_density=0.2, seed=seed)
+    return analyze(rows, name)
+
+
+def _read_level_file(path):
+    """Levels in a text file, separated by blank lines."""
+    with open(path) as f:
+        blocks = f.read().split("\n\n")
+    return [[line for line in b.splitlines() if line.strip()] for b in blocks if b.strip()]
+
+
+def _shipped_levels():
+    from blind_duel import BLIND_DUEL_LEVELS
+    items = [(f"LEVELS[{i}]", rows) for i, rows in enumerate(LEVELS)]
+    items += [(f"BLIND_DUEL_LEVELS[{i}]", rows) for i, rows in enumerate(BLIND_DUEL_LEVELS)]
+    return items
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate levels and report difficulty metrics.")
+    ap.add_argument("files", nargs="*", help="level files (levels separated by blank lines)")
+    ap.add_argument("--generate", type=int, default=0, metavar="N", help="also check N generated arenas")
+    ap.add_argument("--size", default="20x40", help="generated arena size, ROWSxCOLS")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = ap.parse_args(argv)
+
+    items = []
+    for path in args.files:
+        items += [(f"{path}:{i}", rows) for i, rows in enumerate(_read_level_file(path))]
+    if args.generate:
+        h, w = (int(x) for x in args.size.lower().split("x"))
+        items += [(f"arena:{seed}", ("arena", h, w, seed)) for seed in range(args.generate)]
+    if not args.files and not args.generate:
+        items = _shipped_levels()
+
+    t0 = time.perf_counter()
+    if len(items) < 64 or args.jobs == 1:
+        reports = [_check(item) for item in items]
+    else:
+        jobs = args.jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            reports = list(pool.map(_check, items, chunksize=max(1, len(items) // (jobs * 8))))
+    elapsed = time.perf_counter() - t0
+
+    invalid = [r for r in reports if not r["ok"]]
+    summary = {
+        "levels": len(reports),
+        "invalid": len(invalid),
+        "with_warnings": sum(1 for r in reports if r["warnings"]),
+        "seconds": round(elapsed, 3),
+        "levels_per_sec": round(len(reports) / elapsed, 1) if elapsed else None,
+    }
+    out = json.dumps({"summary": summary, "levels": reports}, indent=1)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    for r in invalid[:20]:
+        print(f"  INVALID {r['name']}: " + "; ".join(r["errors"]), file=sys.stderr)
+    print(f"  {summary['levels']} levels, {summary['invalid']} invalid, "
+          f"{summary['levels_per_sec']} levels/s", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())